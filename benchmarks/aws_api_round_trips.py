@@ -0,0 +1,60 @@
+"""End to end AWSApi round trips against the local EC2/RDS stand-in.
+
+Run with: uv run python -m benchmarks.aws_api_round_trips
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from tests.aws_stand_in import AWSStandIn
+
+from hooks_lib.aws_api import AWSApi
+
+CALLS = 200
+# a new session per call loads the service models again, keep it short
+NEW_API_CALLS = 20
+LATENCY = 0.002
+
+
+def main() -> None:
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+
+    for throttle_every in (0, 10):
+        with AWSStandIn(
+            subnets={f"subnet-{i}": f"vpc-{i % 5}" for i in range(100)},
+            latency=LATENCY,
+            throttle_every=throttle_every,
+        ) as stand_in:
+            start = time.perf_counter()
+            for i in range(NEW_API_CALLS):
+                AWSApi(
+                    config_options={"region_name": "us-east-1"},
+                    endpoint_url=stand_in.endpoint_url,
+                ).get_subnet_refs([f"subnet-{i % 100}"])
+            per_call_api = time.perf_counter() - start
+            connections = stand_in.connections
+
+            api = AWSApi(
+                config_options={"region_name": "us-east-1"},
+                endpoint_url=stand_in.endpoint_url,
+            )
+            start = time.perf_counter()
+            for i in range(CALLS):
+                api.get_subnet_refs([f"subnet-{i % 100}"])
+            shared_api = time.perf_counter() - start
+
+            print(
+                f"throttle_every={throttle_every:<3} "
+                f"AWSApi per call: {per_call_api / NEW_API_CALLS * 1000:6.2f} ms/call "
+                f"({connections} connections), "
+                f"shared AWSApi: {shared_api / CALLS * 1000:6.2f} ms/call "
+                f"({stand_in.connections - connections} connections), "
+                f"throttled: {stand_in.throttled}"
+            )
+
+
+if __name__ == "__main__":
+    main()
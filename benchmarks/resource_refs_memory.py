@@ -0,0 +1,117 @@
+"""Memory per 100k resources: boto dicts vs slim references.
+
+Run with: uv run python -m benchmarks.resource_refs_memory
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from hooks_lib.aws_api import AWSApi, SecurityGroupRef, SubnetRef
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RESOURCES = 100_000
+VPCS = 50
+
+
+def subnet_dict(i: int) -> dict[str, Any]:
+    """A DescribeSubnets item as returned by boto"""
+    return {
+        "AvailabilityZone": "us-east-1a",
+        "AvailabilityZoneId": "use1-az1",
+        "AvailableIpAddressCount": 251,
+        "CidrBlock": f"10.{i % 256}.{i // 256 % 256}.0/24",
+        "DefaultForAz": False,
+        "MapPublicIpOnLaunch": False,
+        "State": "available",
+        "SubnetId": f"subnet-{i:017x}",
+        "VpcId": f"vpc-{i % VPCS:017x}",
+        "OwnerId": "123456789012",
+        "AssignIpv6AddressOnCreation": False,
+        "Ipv6CidrBlockAssociationSet": [],
+        "Tags": [{"Key": "Name", "Value": f"subnet-{i}"}],
+        "SubnetArn": f"arn:aws:ec2:us-east-1:123456789012:subnet/subnet-{i:017x}",
+        "EnableDns64": False,
+        "Ipv6Native": False,
+        "PrivateDnsNameOptionsOnLaunch": {
+            "HostnameType": "ip-name",
+            "EnableResourceNameDnsARecord": False,
+            "EnableResourceNameDnsAAAARecord": False,
+        },
+    }
+
+
+def security_group_dict(i: int) -> dict[str, Any]:
+    """A DescribeSecurityGroups item as returned by boto"""
+    return {
+        "Description": f"security group {i}",
+        "GroupName": f"sg-name-{i}",
+        "IpPermissions": [
+            {
+                "FromPort": 5432,
+                "IpProtocol": "tcp",
+                "IpRanges": [{"CidrIp": "10.0.0.0/8"}],
+                "Ipv6Ranges": [],
+                "PrefixListIds": [],
+                "ToPort": 5432,
+                "UserIdGroupPairs": [],
+            }
+        ],
+        "OwnerId": "123456789012",
+        "GroupId": f"sg-{i:017x}",
+        "IpPermissionsEgress": [
+            {
+                "IpProtocol": "-1",
+                "IpRanges": [{"CidrIp": "0.0.0.0/0"}],
+                "Ipv6Ranges": [],
+                "PrefixListIds": [],
+                "UserIdGroupPairs": [],
+            }
+        ],
+        "Tags": [{"Key": "Name", "Value": f"sg-{i}"}],
+        "VpcId": f"vpc-{i % VPCS:017x}",
+    }
+
+
+def measure(build: Callable[[], list[Any]]) -> int:
+    """Bytes retained by the list returned by build"""
+    tracemalloc.start()
+    data = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main() -> None:
+    # both representations are built from fresh boto dicts within their own
+    # measurement window, so the id strings the refs keep are counted
+    subnet_api = AWSApi(config_options={})
+    sg_api = AWSApi(config_options={})
+    results = {
+        "subnet dicts": measure(lambda: [subnet_dict(i) for i in range(RESOURCES)]),
+        "SubnetRef": measure(
+            lambda: [
+                SubnetRef(s["SubnetId"], subnet_api.intern_vpc_id(s["VpcId"]))
+                for s in map(subnet_dict, range(RESOURCES))
+            ]
+        ),
+        "security group dicts": measure(
+            lambda: [security_group_dict(i) for i in range(RESOURCES)]
+        ),
+        "SecurityGroupRef": measure(
+            lambda: [
+                SecurityGroupRef(sg["GroupId"], sg_api.intern_vpc_id(sg["VpcId"]))
+                for sg in map(security_group_dict, range(RESOURCES))
+            ]
+        ),
+    }
+    for name, size in results.items():
+        print(f"{name:<22} {size / 2**20:8.1f} MiB per {RESOURCES} resources")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""terraform.tfvars.json rendering: create_tf_vars_json vs the canonical writer.
+
+Run with: uv run python -m benchmarks.tfvars_writer
+"""
+
+from __future__ import annotations
+
+import io
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from external_resources_io.terraform import create_tf_vars_json
+from tests.conftest import build_input_data
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.tfvars import (
+    dump_tf_vars_json,
+    write_tf_vars_json,
+    write_tf_vars_json_into,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RUNS = 10_000
+
+
+def measure(run: Callable[[], object]) -> float:
+    """Seconds per call"""
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        run()
+    return (time.perf_counter() - start) / RUNS
+
+
+def main() -> None:
+    data = AppInterfaceInput.model_validate(
+        build_input_data(
+            tags={f"tag-{i}": f"value-{i}" for i in range(20)},
+            alarms={"alarm_actions": ["arn:aws:sns:us-east-1:123456789012:alerts"]},
+            client_pools=[
+                {"name": f"consumer-{i}", "max_pool_size": 10} for i in range(5)
+            ],
+        )
+    ).data
+    buffer = io.BytesIO()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "terraform.tfvars.json"
+        results = {
+            "model_dump_json": measure(lambda: data.model_dump_json(exclude_none=True)),
+            "dump_tf_vars_json": measure(lambda: dump_tf_vars_json(data)),
+            "create_tf_vars_json": measure(lambda: create_tf_vars_json(data, output)),
+            "write_tf_vars_json": measure(lambda: write_tf_vars_json(data, output)),
+            "write_tf_vars_json_into": measure(
+                lambda: (
+                    buffer.seek(0),
+                    buffer.truncate(),
+                    write_tf_vars_json_into(data, buffer),
+                )
+            ),
+        }
+    for name, seconds in results.items():
+        print(f"{name:<24} {seconds * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
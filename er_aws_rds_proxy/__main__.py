@@ -1,10 +1,11 @@
+import argparse
+
 from external_resources_io.input import parse_model, read_input_from_file
-from external_resources_io.terraform import (
-    create_backend_tf_file,
-    create_tf_vars_json,
-)
+from external_resources_io.terraform import create_backend_tf_file
 
 from .app_interface_input import AppInterfaceInput
+from .profiling import profile
+from .tfvars import write_tf_vars_json
 
 
 def get_ai_input() -> AppInterfaceInput:
@@ -12,11 +13,18 @@ def get_ai_input() -> AppInterfaceInput:
     return parse_model(AppInterfaceInput, read_input_from_file())
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """Proper entry point for the module."""
-    ai_input = get_ai_input()
-    create_backend_tf_file(ai_input.provision)
-    create_tf_vars_json(ai_input.data)
+    parser = argparse.ArgumentParser(description="Generate the terraform config")
+    parser.add_argument(
+        "--profile", action="store_true", help="Write profiling output to $WORK"
+    )
+    args = parser.parse_args(argv)
+
+    with profile("generate-tf-config", enabled=args.profile):
+        ai_input = get_ai_input()
+        create_backend_tf_file(ai_input.provision)
+        write_tf_vars_json(ai_input.data)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,8 +1,19 @@
 from collections.abc import Sequence
+from datetime import UTC, datetime
 from typing import Self
 
 from external_resources_io.input import AppInterfaceProvision
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from .rules import default_client_password_auth_type, violations
+
+# AWS default when connection_borrow_timeout is not set (seconds)
+DEFAULT_CONNECTION_BORROW_TIMEOUT = 120
+# Upper bound of the derived DatabaseConnectionsBorrowLatency alarm (microseconds)
+MAX_BORROW_LATENCY_THRESHOLD = 100_000
+MIN_BORROW_LATENCY_THRESHOLD = 1_000
+# Log retention cap while debug_logging is on (days)
+DEBUG_LOG_GROUP_RETENTION_IN_DAYS = 7
 
 
 class Auth(BaseModel):
@@ -48,17 +59,88 @@ class Auth(BaseModel):
 
         return self
 
-    @model_validator(mode="after")
-    def is_secret_name_set(self) -> Self:
-        """Validate that secret_name is provided when using SECRETS auth scheme.
+
+class ClientPool(BaseModel):
+    """Client-side connection pool settings of a proxy consumer.
+
+    Used to analyze connection churn against idle_client_timeout, it is not
+    passed to the proxy itself.
+    """
+
+    name: str = Field(description="Consumer name")
+    replicas: int = Field(default=1, ge=1, description="Number of client processes")
+    min_pool_size: int = Field(
+        default=0, ge=0, description="Idle connections the pool keeps open"
+    )
+    max_pool_size: int = Field(ge=1, description="Maximum pool size")
+    keepalive_interval: int | None = Field(
+        default=None,
+        ge=1,
+        description="Seconds between keepalive queries on idle connections",
+    )
+    idle_timeout: int | None = Field(
+        default=None,
+        ge=1,
+        description="Seconds before the pool closes idle connections above min_pool_size",
+    )
+    max_lifetime: int | None = Field(
+        default=None, ge=1, description="Seconds before the pool recycles a connection"
+    )
+    ephemeral: bool = Field(
+        default=False,
+        description="Clients abandon connections without closing them (e.g. lambdas)",
+    )
+
+
+class Alarms(BaseModel):
+    """CloudWatch alarms and dashboard for the proxy.
+
+    Thresholds left unset are derived from the connection pool configuration
+    when possible, alarms with no threshold are not created.
+    """
+
+    alarm_actions: list[str] = Field(
+        default=[], description="ARNs notified when an alarm changes state"
+    )
+    period: int = Field(
+        default=60,
+        description="Alarm evaluation period (10, 30 or a multiple of 60 seconds)",
+    )
+    evaluation_periods: int = Field(
+        default=5, ge=1, description="Periods breaching the threshold before alarming"
+    )
+    borrow_latency_threshold: int | None = Field(
+        default=None,
+        description="DatabaseConnectionsBorrowLatency threshold (microseconds)",
+    )
+    client_connections_threshold: int | None = Field(
+        default=None, description="ClientConnections threshold"
+    )
+    pool_saturation_threshold: int | None = Field(
+        default=90,
+        description="DatabaseConnections threshold as percentage of MaxDatabaseConnectionsAllowed",
+    )
+    session_pinned_threshold: int | None = Field(
+        default=20,
+        description="DatabaseConnectionsCurrentlySessionPinned threshold as percentage of DatabaseConnections",
+    )
+    query_response_latency_threshold: int | None = Field(
+        default=1_000_000,
+        description="QueryDatabaseResponseLatency threshold (microseconds)",
+    )
+    dashboard: bool = Field(default=True, description="Create a CloudWatch dashboard")
+
+    @field_validator("period")
+    @classmethod
+    def check_period(cls, period: int) -> int:
+        """Only periods supported by CloudWatch alarms.
 
         Raises:
-            ValueError: If auth_scheme is "SECRETS" but secret_name is None.
+            ValueError: When period is not 10, 30 or a positive multiple of 60.
         """
-        if self.auth_scheme == "SECRETS" and self.secret_name is None:
-            raise ValueError("secret_name must be set when auth_scheme is SECRETS")
-
-        return self
+        if period not in {10, 30} and (period <= 0 or period % 60):
+            raise ValueError("period must be 10, 30 or a multiple of 60")
+        return period
 
 
 class RdsProxyData(BaseModel):
@@ -74,7 +156,13 @@ class RdsProxyData(BaseModel):
     output_resource_name: str | None = None
     tags: dict[str, str] = Field(description="Resource tags")
 
+    alarms: Alarms | None = Field(
+        default=None, description="CloudWatch alarms and dashboard"
+    )
     auth: Sequence[Auth]
+    client_pools: list[ClientPool] = Field(
+        default=[], description="Client connection pool settings per consumer"
+    )
     connection_borrow_timeout: int | None = Field(
         default=None, description="Seconds to wait for connection availability"
     )
@@ -82,6 +170,9 @@ class RdsProxyData(BaseModel):
     debug_logging: bool = Field(
         default=False, description="Enable detailed SQL statement logging"
     )
+    debug_logging_expires_at: datetime | None = Field(
+        default=None, description="Time after which debug_logging is turned off"
+    )
     engine_family: str = Field(
         default="POSTGRESQL", description="Database engine family (MYSQL or POSTGRESQL)"
     )
@@ -120,15 +211,73 @@ class RdsProxyData(BaseModel):
         """Set default client password authentication types based on engine family.
 
         For each auth configuration, sets the client_password_auth_type based on
-        the database engine family when not explicitly provided:
+        the database engine family when not explicitly provided, see
+        `rules.ENGINE_FAMILIES`:
+        - MYSQL engine family: "MYSQL_NATIVE_PASSWORD"
         - POSTGRES engine family: "POSTGRES_SCRAM_SHA_256"
+        - SQLSERVER engine family: "SQL_SERVER_AUTHENTICATION"
         """
+        default = default_client_password_auth_type(self.engine_family)
         for auth_item in self.auth:
-            if (
-                auth_item.client_password_auth_type is None
-                and self.engine_family == "POSTGRESQL"
-            ):
-                auth_item.client_password_auth_type = "POSTGRES_SCRAM_SHA_256"  # ruff: ignore[hardcoded-password-string]
+            if auth_item.client_password_auth_type is None:
+                auth_item.client_password_auth_type = default
+        return self
+
+    @model_validator(mode="after")
+    def expire_debug_logging(self) -> Self:
+        """Turn debug logging off once it expires and cap log retention while on.
+
+        Timestamps without timezone are considered UTC. A retention of 0
+        (never expire) is capped as well.
+        """
+        if expires_at := self.debug_logging_expires_at:
+            if expires_at.tzinfo is None:
+                expires_at = self.debug_logging_expires_at = expires_at.replace(
+                    tzinfo=UTC
+                )
+            if expires_at <= datetime.now(UTC):
+                self.debug_logging = False
+
+        # 0 means the logs never expire
+        if self.debug_logging and not (
+            0 < self.log_group_retention_in_days <= DEBUG_LOG_GROUP_RETENTION_IN_DAYS
+        ):
+            self.log_group_retention_in_days = DEBUG_LOG_GROUP_RETENTION_IN_DAYS
+        return self
+
+    @model_validator(mode="after")
+    def set_alarm_defaults(self) -> Self:
+        """Derive unset alarm thresholds from the connection pool configuration.
+
+        - borrow_latency_threshold: 1% of connection_borrow_timeout, between
+          1ms and 100ms
+
+        Thresholds explicitly set to None stay None, dropping the alarm.
+        """
+        if (
+            self.alarms
+            and "borrow_latency_threshold" not in self.alarms.model_fields_set
+        ):
+            borrow_timeout = (
+                self.connection_borrow_timeout
+                if self.connection_borrow_timeout is not None
+                else DEFAULT_CONNECTION_BORROW_TIMEOUT
+            )
+            self.alarms.borrow_latency_threshold = max(
+                MIN_BORROW_LATENCY_THRESHOLD,
+                min(borrow_timeout * 10_000, MAX_BORROW_LATENCY_THRESHOLD),
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_rules(self) -> Self:
+        """Validate cross-field constraints, see `rules`.
+
+        Raises:
+            ValueError: With every violated rule, one per line.
+        """
+        if errors := violations(self):
+            raise ValueError("\n".join(map(str, errors)))
         return self
 
 
@@ -0,0 +1,228 @@
+import argparse
+import logging
+import os
+import shutil
+import subprocess  # ruff: ignore[suspicious-subprocess-import]
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from external_resources_io.input import parse_model, read_input_from_file
+from external_resources_io.log import setup_logging
+from external_resources_io.terraform import create_backend_tf_file
+from pydantic import BaseModel
+
+from .app_interface_input import AppInterfaceInput
+from .tfvars import write_tf_vars_json
+
+logger = logging.getLogger(__name__)
+
+# generated per identifier, never shared with the template
+GENERATED_FILES = {"backend.tf", "terraform.tfvars.json"}
+# provider binaries, hardlinked instead of copied. The rest of .terraform
+# (backend state, modules.json) is rewritten in place by terraform init.
+PROVIDERS_DIR = (".terraform", "providers")
+
+
+class GroupReport(BaseModel):
+    """Rendering results of the inputs sharing a region and state bucket"""
+
+    region: str
+    tf_state_bucket: str
+    identifiers: list[str]
+    link_seconds: float = 0.0
+    render_seconds: float = 0.0
+
+
+class BulkReport(BaseModel):
+    """Per stage timings of a bulk run"""
+
+    stages: dict[str, float] = {}
+    groups: list[GroupReport] = []
+
+
+def group_inputs(
+    inputs: list[AppInterfaceInput],
+) -> dict[tuple[str, str], list[AppInterfaceInput]]:
+    """Group inputs by region and terraform state bucket"""
+    groups: dict[tuple[str, str], list[AppInterfaceInput]] = defaultdict(list)
+    for ai_input in inputs:
+        key = (
+            ai_input.data.region,
+            ai_input.provision.module_provision_data.tf_state_bucket,
+        )
+        groups[key].append(ai_input)
+    return dict(sorted(groups.items()))
+
+
+def prepare_template(module_dir: Path, template_dir: Path, *, init: bool) -> None:
+    """Copy the module into a working tree template.
+
+    With init, providers are installed once into the template with
+    `terraform init -backend=false`, using TF_PLUGIN_CACHE_DIR when set, so
+    the per identifier trees do not download or extract anything.
+    """
+    shutil.copytree(
+        module_dir,
+        template_dir,
+        symlinks=True,
+        ignore=shutil.ignore_patterns(*GENERATED_FILES),
+        dirs_exist_ok=True,
+    )
+    if init:
+        subprocess.run(
+            [
+                "terraform",
+                f"-chdir={template_dir}",
+                "init",
+                "-backend=false",
+                "-input=false",
+            ],
+            check=True,
+            capture_output=True,
+        )
+
+
+def link_tree(template_dir: Path, work_dir: Path) -> None:
+    """Create or refresh a working tree from the template.
+
+    Provider binaries are hardlinked (falling back to copies across
+    filesystems), everything else is copied so terraform can rewrite it
+    without touching the template. Existing files are replaced, never written
+    through, so reruns into the same work dir are safe.
+    """
+    for root, dirs, files in os.walk(template_dir):
+        src_root = Path(root)
+        rel = src_root.relative_to(template_dir)
+        dst_root = work_dir / rel
+        dst_root.mkdir(parents=True, exist_ok=True)
+        shared = rel.parts[: len(PROVIDERS_DIR)] == PROVIDERS_DIR
+        for name in [*files, *(d for d in dirs if (src_root / d).is_symlink())]:
+            src, dst = src_root / name, dst_root / name
+            # unlink, a hardlink from a previous run shares the template inode
+            if dst.is_symlink() or dst.is_file():
+                dst.unlink()
+            if src.is_symlink():
+                dst.symlink_to(src.readlink())
+            elif shared:
+                try:
+                    dst.hardlink_to(src)
+                except OSError:
+                    shutil.copy2(src, dst)
+            else:
+                shutil.copy2(src, dst)
+
+
+def render(ai_input: AppInterfaceInput, work_dir: Path) -> None:
+    """Generate the terraform config of one input into its working tree"""
+    create_backend_tf_file(ai_input.provision, work_dir / "backend.tf")
+    write_tf_vars_json(ai_input.data, work_dir / "terraform.tfvars.json")
+
+
+def work_dir_for(output_dir: Path, ai_input: AppInterfaceInput) -> Path:
+    """Working tree of an input: <output>/<region>/<state bucket>/<identifier>"""
+    return (
+        output_dir
+        / ai_input.data.region
+        / ai_input.provision.module_provision_data.tf_state_bucket
+        / ai_input.provision.identifier
+    )
+
+
+def _build(
+    ai_input: AppInterfaceInput, template_dir: Path, output_dir: Path
+) -> tuple[float, float]:
+    work_dir = work_dir_for(output_dir, ai_input)
+    start = time.perf_counter()
+    link_tree(template_dir, work_dir)
+    linked = time.perf_counter()
+    render(ai_input, work_dir)
+    return linked - start, time.perf_counter() - linked
+
+
+def bulk_generate(
+    input_files: list[Path],
+    output_dir: Path,
+    module_dir: Path,
+    *,
+    init_template: bool = False,
+    max_workers: int | None = None,
+) -> BulkReport:
+    """Render the terraform config of many inputs concurrently"""
+    report = BulkReport()
+
+    start = time.perf_counter()
+    inputs = [
+        parse_model(AppInterfaceInput, read_input_from_file(f)) for f in input_files
+    ]
+    groups = group_inputs(inputs)
+    report.stages["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    template_dir = output_dir / ".template"
+    prepare_template(module_dir, template_dir, init=init_template)
+    report.stages["template"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            key: [
+                executor.submit(_build, ai_input, template_dir, output_dir)
+                for ai_input in group
+            ]
+            for key, group in groups.items()
+        }
+        for (region, bucket), group_futures in futures.items():
+            timings = [f.result() for f in group_futures]
+            report.groups.append(
+                GroupReport(
+                    region=region,
+                    tf_state_bucket=bucket,
+                    identifiers=[
+                        i.provision.identifier for i in groups[region, bucket]
+                    ],
+                    link_seconds=sum(t[0] for t in timings),
+                    render_seconds=sum(t[1] for t in timings),
+                )
+            )
+    report.stages["build"] = time.perf_counter() - start
+    report.stages["link"] = sum(g.link_seconds for g in report.groups)
+    report.stages["render"] = sum(g.render_seconds for g in report.groups)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Render the terraform config of many inputs into per identifier trees"""
+    parser = argparse.ArgumentParser(description="Bulk terraform config generation")
+    parser.add_argument("input_files", nargs="+", type=Path)
+    parser.add_argument("--output-dir", type=Path, required=True)
+    parser.add_argument(
+        "--module-dir",
+        type=Path,
+        default=Path(os.environ.get("TERRAFORM_MODULE_SRC_DIR", "module")),
+    )
+    parser.add_argument(
+        "--init-template",
+        action="store_true",
+        help="Run terraform init once in the shared template",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = bulk_generate(
+        args.input_files,
+        args.output_dir,
+        args.module_dir,
+        init_template=args.init_template,
+        max_workers=args.workers,
+    )
+    for stage, seconds in report.stages.items():
+        logger.info(f"{stage}: {seconds:.3f}s")
+    sys.stdout.write(report.model_dump_json(indent=2) + "\n")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import math
+import sys
+
+from external_resources_io.input import parse_model, read_input_from_file
+from pydantic import BaseModel, Field
+
+from .app_interface_input import (
+    DEFAULT_CONNECTION_BORROW_TIMEOUT,
+    AppInterfaceInput,
+    RdsProxyData,
+)
+
+# Share of borrows allowed to hit connection_borrow_timeout before warning
+BORROW_TIMEOUT_RISK = 0.001
+# Minimum spare backend connections, as a share of the pool
+MIN_HEADROOM_RATIO = 0.2
+PERCENTILES = (50, 95, 99)
+
+
+class Workload(BaseModel):
+    """Expected client workload for a proxy"""
+
+    client_connections: int = Field(gt=0, description="Concurrent client connections")
+    queries_per_second: float = Field(gt=0, description="Transactions per second")
+    mean_transaction_time: float = Field(
+        gt=0, description="Mean time a transaction holds a connection (seconds)"
+    )
+    pinning_ratio: float = Field(
+        default=0.0, ge=0, le=1, description="Share of client sessions pinned"
+    )
+    db_max_connections: int = Field(
+        gt=0, description="max_connections of the target database"
+    )
+
+
+class CapacityReport(BaseModel):
+    """Estimated proxy capacity for a workload.
+
+    Unpinned transactions are modelled as an M/M/c queue (Erlang C) over the
+    backend connections not held by pinned sessions. Wait times are None when
+    the pool is saturated.
+    """
+
+    pool_size: int = Field(description="Backend connections the proxy may open")
+    pinned_connections: float = Field(
+        description="Backend connections held by pinned sessions"
+    )
+    busy_connections: float = Field(
+        description="Backend connections busy with unpinned transactions (Little's law)"
+    )
+    backend_connections_needed: float
+    headroom: float = Field(description="Spare backend connections")
+    wait_probability: float = Field(description="Probability a borrow has to wait")
+    borrow_wait: dict[int, float | None] = Field(
+        description="Borrow wait percentiles (seconds)"
+    )
+    borrow_timeout: int
+    borrow_timeout_probability: float = Field(
+        description="Probability a borrow exceeds connection_borrow_timeout"
+    )
+    warnings: list[str] = []
+
+
+def erlang_c(servers: int, load: float) -> float:
+    """Probability of queueing in an M/M/c system with offered load in Erlangs"""
+    if load >= servers:
+        return 1.0
+    # Erlang B by recursion, numerically stable for large pools
+    blocking = 1.0
+    for k in range(1, servers + 1):
+        blocking = load * blocking / (k + load * blocking)
+    return blocking / (1 - load / servers * (1 - blocking))
+
+
+def capacity_report(data: RdsProxyData, workload: Workload) -> CapacityReport:
+    """Estimate backend connections, borrow waits and headroom for a workload"""
+    pool_size = workload.db_max_connections * data.max_connections_percent // 100
+    pinned = workload.client_connections * workload.pinning_ratio
+    arrival_rate = workload.queries_per_second * (1 - workload.pinning_ratio)
+    busy = arrival_rate * workload.mean_transaction_time
+    needed = pinned + busy
+    servers = pool_size - math.ceil(pinned)
+    borrow_timeout = (
+        data.connection_borrow_timeout
+        if data.connection_borrow_timeout is not None
+        else DEFAULT_CONNECTION_BORROW_TIMEOUT
+    )
+
+    warnings = []
+    if servers <= 0 or busy >= servers:
+        wait_probability = timeout_probability = 1.0
+        borrow_wait: dict[int, float | None] = dict.fromkeys(PERCENTILES)
+        warnings.append(
+            f"Pool saturated: {needed:.0f} backend connections needed but "
+            f"max_connections_percent={data.max_connections_percent} allows {pool_size}"
+        )
+    else:
+        wait_probability = erlang_c(servers, busy)
+        # P(wait > t) = C * exp(-(c - a) / S * t), percentiles at or below
+        # 1 - C do not wait. C underflows to 0 for large, lightly loaded pools.
+        decay = (servers - busy) / workload.mean_transaction_time
+        borrow_wait = {
+            p: math.log(wait_probability / (1 - p / 100)) / decay
+            if wait_probability > 1 - p / 100
+            else 0.0
+            for p in PERCENTILES
+        }
+        timeout_probability = wait_probability * math.exp(-decay * borrow_timeout)
+
+    if timeout_probability > BORROW_TIMEOUT_RISK:
+        warnings.append(
+            f"{timeout_probability:.2%} of borrows expected to exceed "
+            f"connection_borrow_timeout ({borrow_timeout}s)"
+        )
+    if needed <= pool_size and pool_size - needed < pool_size * MIN_HEADROOM_RATIO:
+        warnings.append(
+            f"Less than {MIN_HEADROOM_RATIO:.0%} headroom: {needed:.0f} of {pool_size} "
+            "backend connections needed"
+        )
+    request_interval = workload.client_connections / workload.queries_per_second
+    if data.idle_client_timeout < request_interval:
+        warnings.append(
+            f"Clients send a request every {request_interval:.0f}s on average, "
+            f"idle_client_timeout ({data.idle_client_timeout}s) will disconnect them "
+            "between requests"
+        )
+
+    return CapacityReport(
+        pool_size=pool_size,
+        pinned_connections=pinned,
+        busy_connections=busy,
+        backend_connections_needed=needed,
+        headroom=pool_size - needed,
+        wait_probability=wait_probability,
+        borrow_wait=borrow_wait,
+        borrow_timeout=borrow_timeout,
+        borrow_timeout_probability=timeout_probability,
+        warnings=warnings,
+    )
+
+
+def format_report(data: RdsProxyData, report: CapacityReport) -> str:
+    """Human readable capacity report"""
+    waits = ", ".join(
+        f"p{p}={'n/a' if w is None else f'{w * 1000:.1f}ms'}"
+        for p, w in report.borrow_wait.items()
+    )
+    lines = [
+        f"Capacity report for {data.identifier}",
+        f"  pool size:                  {report.pool_size}",
+        f"  pinned connections:         {report.pinned_connections:.1f}",
+        f"  busy connections:           {report.busy_connections:.1f}",
+        f"  backend connections needed: {report.backend_connections_needed:.1f}",
+        f"  headroom:                   {report.headroom:.1f}",
+        f"  borrow wait probability:    {report.wait_probability:.2%}",
+        f"  borrow wait:                {waits}",
+        f"  borrow timeout probability: {report.borrow_timeout_probability:.4%}",
+    ]
+    lines.extend(f"WARNING: {w}" for w in report.warnings)
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the capacity report for the input proxy and a workload"""
+    parser = argparse.ArgumentParser(description="RDS Proxy capacity report")
+    parser.add_argument("--client-connections", type=int, required=True)
+    parser.add_argument("--qps", type=float, required=True)
+    parser.add_argument(
+        "--mean-transaction-ms",
+        type=float,
+        required=True,
+        help="Mean transaction time in milliseconds",
+    )
+    parser.add_argument("--pinning-ratio", type=float, default=0.0)
+    parser.add_argument("--db-max-connections", type=int, required=True)
+    parser.add_argument("--json", action="store_true", help="Print JSON output")
+    args = parser.parse_args(argv)
+
+    ai_input = parse_model(AppInterfaceInput, read_input_from_file())
+    workload = Workload(
+        client_connections=args.client_connections,
+        queries_per_second=args.qps,
+        mean_transaction_time=args.mean_transaction_ms / 1000,
+        pinning_ratio=args.pinning_ratio,
+        db_max_connections=args.db_max_connections,
+    )
+    report = capacity_report(ai_input.data, workload)
+    sys.stdout.write(
+        report.model_dump_json(indent=2) + "\n"
+        if args.json
+        else format_report(ai_input.data, report)
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
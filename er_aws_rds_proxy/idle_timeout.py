@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from .app_interface_input import ClientPool, RdsProxyData
+
+# idle_client_timeout bounds accepted by RDS Proxy
+MIN_IDLE_CLIENT_TIMEOUT = 1
+MAX_IDLE_CLIENT_TIMEOUT = 28800
+# Seconds the proxy should wait beyond the moment a pool retires a connection
+RETIRE_MARGIN = 60
+# Short timeout for consumers that abandon their connections
+EPHEMERAL_IDLE_CLIENT_TIMEOUT = 300
+# idle_client_timeout above recommended * WASTE_FACTOR keeps stale connections
+WASTE_FACTOR = 4
+TLS_HANDSHAKES_PER_SECOND_WARNING = 50
+
+
+class ClientPoolAnalysis(BaseModel):
+    """Predicted connection churn of a single consumer"""
+
+    name: str
+    connections: int = Field(description="Client connections at full pool size")
+    connection_lifetime: float | None = Field(
+        description="Seconds a connection lives before being reopened, None if never"
+    )
+    min_idle_connections: int = Field(
+        default=0, description="Idle connections the pool keeps open (min_pool_size)"
+    )
+    min_idle_connection_lifetime: float | None = Field(
+        default=None,
+        description="Seconds a min_pool_size connection lives, None if never",
+    )
+    reconnects_per_second: float
+    tls_handshakes_per_second: float
+
+
+class IdleTimeoutAnalysis(BaseModel):
+    """idle_client_timeout analysis for all consumers of a proxy"""
+
+    consumers: list[ClientPoolAnalysis]
+    reconnects_per_second: float
+    tls_handshakes_per_second: float
+    recommended_idle_client_timeout: int
+    warnings: list[str] = []
+
+
+def _retire_time(pool: ClientPool, *, min_idle: bool = False) -> int | None:
+    """Seconds after which the client pool itself closes a connection.
+
+    Pools keep min_pool_size connections open however long they are idle,
+    only max_lifetime retires those.
+    """
+    limits = (
+        (pool.max_lifetime,) if min_idle else (pool.idle_timeout, pool.max_lifetime)
+    )
+    return min((t for t in limits if t), default=None)
+
+
+def _kept_alive(pool: ClientPool, idle_client_timeout: int) -> bool:
+    return (
+        pool.keepalive_interval is not None
+        and pool.keepalive_interval < idle_client_timeout
+    )
+
+
+def _lifetime(
+    pool: ClientPool, idle_client_timeout: int, *, min_idle: bool
+) -> int | None:
+    """Seconds until the pool or the proxy closes a connection, None if never"""
+    limits = [_retire_time(pool, min_idle=min_idle)]
+    if not _kept_alive(pool, idle_client_timeout):
+        limits.append(idle_client_timeout)
+    return min((t for t in limits if t), default=None)
+
+
+def _required_timeout(pool: ClientPool) -> int | None:
+    """Shortest idle_client_timeout that lets the pool manage its connections"""
+    if pool.ephemeral:
+        return None
+    retire = _retire_time(pool, min_idle=pool.min_pool_size > 0)
+    candidates = [
+        t + RETIRE_MARGIN for t in (retire, pool.keepalive_interval) if t is not None
+    ]
+    return min(candidates) if candidates else None
+
+
+def analyze_pool(
+    pool: ClientPool, idle_client_timeout: int, *, require_tls: bool
+) -> ClientPoolAnalysis:
+    """Predict reconnect and TLS handshake rates for one consumer.
+
+    Connections above min_pool_size are retired by the pool idle timeout,
+    the min_pool_size ones stay open while idle.
+    """
+    connections = pool.max_pool_size * pool.replicas
+    min_idle = min(pool.min_pool_size, pool.max_pool_size) * pool.replicas
+    lifetime = _lifetime(pool, idle_client_timeout, min_idle=False)
+    min_idle_lifetime = _lifetime(pool, idle_client_timeout, min_idle=True)
+    reconnects = sum(
+        n / t
+        for n, t in ((connections - min_idle, lifetime), (min_idle, min_idle_lifetime))
+        if t
+    )
+    return ClientPoolAnalysis(
+        name=pool.name,
+        connections=connections,
+        connection_lifetime=lifetime,
+        min_idle_connections=min_idle,
+        min_idle_connection_lifetime=min_idle_lifetime if min_idle else None,
+        reconnects_per_second=reconnects,
+        tls_handshakes_per_second=reconnects if require_tls else 0.0,
+    )
+
+
+def recommend_idle_client_timeout(pools: list[ClientPool]) -> int:
+    """Recommend an idle_client_timeout for a set of consumers.
+
+    Pooled consumers need the proxy to outlive their own idle handling,
+    otherwise the proxy drops connections the pool still considers usable.
+    When only ephemeral consumers exist, a short timeout reclaims the
+    connections they abandon.
+    """
+    required = [t for t in map(_required_timeout, pools) if t is not None]
+    if required:
+        timeout = max(required)
+    elif all(p.ephemeral for p in pools):
+        timeout = EPHEMERAL_IDLE_CLIENT_TIMEOUT
+    else:
+        timeout = MAX_IDLE_CLIENT_TIMEOUT
+    return max(MIN_IDLE_CLIENT_TIMEOUT, min(timeout, MAX_IDLE_CLIENT_TIMEOUT))
+
+
+def analyze_idle_timeout(data: RdsProxyData) -> IdleTimeoutAnalysis:
+    """Analyze idle_client_timeout against the consumers client pools"""
+    timeout = data.idle_client_timeout
+    if not data.client_pools:
+        return IdleTimeoutAnalysis(
+            consumers=[],
+            reconnects_per_second=0.0,
+            tls_handshakes_per_second=0.0,
+            recommended_idle_client_timeout=timeout,
+        )
+    consumers = [
+        analyze_pool(p, timeout, require_tls=data.require_tls)
+        for p in data.client_pools
+    ]
+    recommended = recommend_idle_client_timeout(data.client_pools)
+    reconnects = sum(c.reconnects_per_second for c in consumers)
+    handshakes = sum(c.tls_handshakes_per_second for c in consumers)
+
+    warnings = []
+    for pool, consumer in zip(data.client_pools, consumers, strict=True):
+        if pool.ephemeral or _kept_alive(pool, timeout):
+            continue
+        retire = _retire_time(pool)
+        min_idle_retire = _retire_time(pool, min_idle=True)
+        if retire is None or retire >= timeout:
+            warnings.append(
+                f"idle_client_timeout ({timeout}s) closes idle connections of "
+                f"{pool.name} before its pool retires them, causing "
+                f"{consumer.reconnects_per_second:.3g} reconnects/s; set a keepalive "
+                f"or an idle timeout/max lifetime below {timeout}s"
+            )
+        elif consumer.min_idle_connections and (
+            min_idle_retire is None or min_idle_retire >= timeout
+        ):
+            warnings.append(
+                f"idle_client_timeout ({timeout}s) closes the "
+                f"{consumer.min_idle_connections} min_pool_size connections of "
+                f"{pool.name} while idle, causing "
+                f"{consumer.reconnects_per_second:.3g} reconnects/s; set a keepalive "
+                f"or a max lifetime below {timeout}s"
+            )
+    if timeout < recommended:
+        warnings.append(
+            f"idle_client_timeout ({timeout}s) is shorter than the client pools "
+            f"need, recommended: {recommended}s"
+        )
+    elif (
+        any(p.ephemeral for p in data.client_pools)
+        and timeout > recommended * WASTE_FACTOR
+    ):
+        warnings.append(
+            f"idle_client_timeout ({timeout}s) keeps abandoned connections open "
+            f"much longer than needed, recommended: {recommended}s"
+        )
+    if handshakes > TLS_HANDSHAKES_PER_SECOND_WARNING:
+        warnings.append(
+            f"Connection churn causes {handshakes:.0f} TLS handshakes/s on the proxy"
+        )
+
+    return IdleTimeoutAnalysis(
+        consumers=consumers,
+        reconnects_per_second=reconnects,
+        tls_handshakes_per_second=handshakes,
+        recommended_idle_client_timeout=recommended,
+        warnings=warnings,
+    )
@@ -0,0 +1,128 @@
+"""Opt-in profiling of the entry points and hooks.
+
+Enabled with `--profile` or `PROFILE=1`. Writes to $WORK (or the current
+directory when unset):
+
+- <name>.prof: cProfile stats, for `python -m pstats` or snakeviz
+- <name>.collapsed: sampled stacks in collapsed format, for flamegraph.pl or
+  speedscope
+- <name>.memory.txt: tracemalloc peak and top allocation sites
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "PROFILE"
+WORK_DIR_ENV = "WORK"
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 20
+
+
+def profiling_enabled() -> bool:
+    """Whether PROFILE is set to a true value"""
+    return os.environ.get(PROFILE_ENV, "").lower() in {"1", "true", "yes", "on"}
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stack of a thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # ruff: ignore[private-member-access]
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        """Start sampling"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling"""
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Samples in collapsed stack format, one `frame;frame;... count` per line"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.stacks.items())
+        )
+
+
+def _memory_summary(snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    lines = [f"Peak traced memory: {peak / 2**20:.1f} MiB", "Top allocation sites:"]
+    lines.extend(
+        f"  {stat.size / 2**10:10.1f} KiB {stat.count:8} blocks  {stat.traceback}"
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+    )
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def profile(name: str, *, enabled: bool = False) -> Generator[None]:
+    """Profile the block when enabled or PROFILE is set, otherwise do nothing"""
+    if not (enabled or profiling_enabled()):
+        yield
+        return
+
+    output = Path(os.environ.get(WORK_DIR_ENV, ".")) / name
+    output.parent.mkdir(parents=True, exist_ok=True)
+    sampler = StackSampler(threading.get_ident())
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        profiler.dump_stats(output.with_suffix(".prof"))
+        output.with_suffix(".collapsed").write_text(
+            sampler.collapsed(), encoding="utf-8"
+        )
+        output.with_suffix(".memory.txt").write_text(
+            _memory_summary(snapshot, peak), encoding="utf-8"
+        )
+        logger.info(
+            f"Profiled {name}: {elapsed:.3f}s, {sum(sampler.stacks.values())} samples, "
+            f"peak memory {peak / 2**20:.1f} MiB, written to {output}.*"
+        )
@@ -0,0 +1,219 @@
+"""Table driven cross-field validation of RdsProxyData.
+
+Rules are declared as data in the tables below and compiled once per engine
+family into a flat tuple of checks. All checks run on every input, so every
+violation is reported at once instead of the first one only.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from operator import attrgetter
+from typing import TYPE_CHECKING, NamedTuple
+
+from .idle_timeout import MAX_IDLE_CLIENT_TIMEOUT, MIN_IDLE_CLIENT_TIMEOUT
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from .app_interface_input import RdsProxyData
+
+
+class Violation(NamedTuple):
+    """A rule broken by an input"""
+
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        """field: message"""
+        return f"{self.field}: {self.message}"
+
+
+class Range(NamedTuple):
+    """field must be between minimum and maximum, unset values are not checked"""
+
+    field: str
+    minimum: int
+    maximum: int
+
+    def compile(self) -> Callable[[object], str | None]:
+        """Function returning the violation message of an object, if any"""
+        value, minimum, maximum = attrgetter(self.field), self.minimum, self.maximum
+        message = f"{self.field} must be between {minimum} and {maximum}, got "
+
+        def check(obj: object) -> str | None:
+            v = value(obj)
+            return None if v is None or minimum <= v <= maximum else f"{message}{v}"
+
+        return check
+
+
+class NotGreaterThan(NamedTuple):
+    """field must not be greater than other, unset values are not checked"""
+
+    field: str
+    other: str
+
+    def compile(self) -> Callable[[object], str | None]:
+        """Function returning the violation message of an object, if any"""
+        value, other_value = attrgetter(self.field), attrgetter(self.other)
+        field, other = self.field, self.other
+
+        def check(obj: object) -> str | None:
+            v, limit = value(obj), other_value(obj)
+            if v is None or limit is None or v <= limit:
+                return None
+            return f"{field} ({v}) must not be greater than {other} ({limit})"
+
+        return check
+
+
+class OneOf(NamedTuple):
+    """field must be one of values, unset values are not checked"""
+
+    field: str
+    values: frozenset[str]
+
+    def compile(self) -> Callable[[object], str | None]:
+        """Function returning the violation message of an object, if any"""
+        value, values = attrgetter(self.field), self.values
+        message = f"{self.field} must be one of {', '.join(sorted(values))}, got "
+
+        def check(obj: object) -> str | None:
+            v = value(obj)
+            return None if v is None or v in values else f"{message}{v}"
+
+        return check
+
+
+class RequiredWhen(NamedTuple):
+    """field must be set when condition_field equals condition_value"""
+
+    field: str
+    condition_field: str
+    condition_value: str
+
+    def compile(self) -> Callable[[object], str | None]:
+        """Function returning the violation message of an object, if any"""
+        value, condition = attrgetter(self.field), attrgetter(self.condition_field)
+        condition_value = self.condition_value
+        message = (
+            f"{self.field} must be set when {self.condition_field} is {condition_value}"
+        )
+
+        def check(obj: object) -> str | None:
+            if value(obj) is None and condition(obj) == condition_value:
+                return message
+            return None
+
+        return check
+
+
+class EngineFamily(NamedTuple):
+    """Engine family specific settings"""
+
+    client_password_auth_type: str
+    client_password_auth_types: frozenset[str]
+    # RDS engines a proxy of this family can target
+    engines: frozenset[str]
+
+
+Rule = Range | NotGreaterThan | OneOf | RequiredWhen
+
+ENGINE_FAMILIES = {
+    "MYSQL": EngineFamily(
+        client_password_auth_type="MYSQL_NATIVE_PASSWORD",  # ruff: ignore[hardcoded-password-func-arg]
+        client_password_auth_types=frozenset({
+            "MYSQL_NATIVE_PASSWORD",
+            "MYSQL_CACHING_SHA2_PASSWORD",
+        }),
+        engines=frozenset({"mysql", "mariadb", "aurora-mysql"}),
+    ),
+    "POSTGRESQL": EngineFamily(
+        client_password_auth_type="POSTGRES_SCRAM_SHA_256",  # ruff: ignore[hardcoded-password-func-arg]
+        client_password_auth_types=frozenset({
+            "POSTGRES_SCRAM_SHA_256",
+            "POSTGRES_MD5",
+        }),
+        engines=frozenset({"postgres", "aurora-postgresql"}),
+    ),
+    "SQLSERVER": EngineFamily(
+        client_password_auth_type="SQL_SERVER_AUTHENTICATION",  # ruff: ignore[hardcoded-password-func-arg]
+        client_password_auth_types=frozenset({"SQL_SERVER_AUTHENTICATION"}),
+        engines=frozenset({
+            "sqlserver-ee",
+            "sqlserver-se",
+            "sqlserver-ex",
+            "sqlserver-web",
+        }),
+    ),
+}
+
+# Limits enforced by the RDS and IAM APIs
+PROXY_RULES: tuple[Rule, ...] = (
+    OneOf("engine_family", frozenset(ENGINE_FAMILIES)),
+    Range("max_connections_percent", 1, 100),
+    Range("max_idle_connections_percent", 0, 100),
+    NotGreaterThan("max_idle_connections_percent", "max_connections_percent"),
+    Range("idle_client_timeout", MIN_IDLE_CLIENT_TIMEOUT, MAX_IDLE_CLIENT_TIMEOUT),
+    Range("connection_borrow_timeout", 0, 3600),
+    Range("iam_role_max_session_duration", 3600, 43200),
+)
+
+AUTH_RULES: tuple[Rule, ...] = (
+    OneOf("auth_scheme", frozenset({"SECRETS"})),
+    OneOf("iam_auth", frozenset({"DISABLED", "REQUIRED", "ENABLED"})),
+    RequiredWhen("secret_name", "auth_scheme", "SECRETS"),
+)
+
+
+def _proxy_check(rule: Rule) -> Callable[[RdsProxyData], Iterator[Violation]]:
+    check = rule.compile()
+
+    def run(data: RdsProxyData) -> Iterator[Violation]:
+        if message := check(data):
+            yield Violation(rule.field, message)
+
+    return run
+
+
+def _auth_check(
+    rules: tuple[Rule, ...],
+) -> Callable[[RdsProxyData], Iterator[Violation]]:
+    checks = [(rule.field, rule.compile()) for rule in rules]
+
+    def run(data: RdsProxyData) -> Iterator[Violation]:
+        for i, auth in enumerate(data.auth):
+            for field, check in checks:
+                if message := check(auth):
+                    yield Violation(f"auth[{i}].{field}", message)
+
+    return run
+
+
+@cache
+def compile_rules(
+    engine_family: str,
+) -> tuple[Callable[[RdsProxyData], Iterator[Violation]], ...]:
+    """Flat list of checks for an engine family, compiled once per family"""
+    auth_rules = AUTH_RULES
+    if engine := ENGINE_FAMILIES.get(engine_family):
+        auth_rules += (
+            OneOf("client_password_auth_type", engine.client_password_auth_types),
+        )
+    return (
+        *(_proxy_check(rule) for rule in PROXY_RULES),
+        _auth_check(auth_rules),
+    )
+
+
+def violations(data: RdsProxyData) -> list[Violation]:
+    """All rules broken by the input"""
+    return [v for check in compile_rules(data.engine_family) for v in check(data)]
+
+
+def default_client_password_auth_type(engine_family: str) -> str | None:
+    """client_password_auth_type used when an auth item does not set one"""
+    engine = ENGINE_FAMILIES.get(engine_family)
+    return engine.client_password_auth_type if engine else None
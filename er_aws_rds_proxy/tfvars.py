@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from external_resources_io.config import Config
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+def dump_tf_vars_json(data: BaseModel) -> bytes:
+    """Canonical terraform.tfvars.json content of a model.
+
+    None values are left out, as in `create_tf_vars_json`. Keys are sorted
+    and no whitespace is emitted, so equal inputs always give identical
+    bytes, which can be hashed or diffed directly.
+    """
+    # pydantic-core emits fields in declaration order and dicts in insertion
+    # order, it has no key sorting of its own
+    obj = type(data).__pydantic_serializer__.to_python(
+        data, mode="json", exclude_none=True
+    )
+    return json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+def write_tf_vars_json_into(data: BaseModel, buffer: IO[bytes]) -> int:
+    """Write the canonical tfvars JSON into a caller provided buffer.
+
+    Returns the number of bytes written.
+    """
+    return buffer.write(dump_tf_vars_json(data))
+
+
+def write_tf_vars_json(data: BaseModel, output_file: Path | str | None = None) -> Path:
+    """Atomically write the canonical tfvars JSON.
+
+    The content goes to a temporary file next to the target, which is then
+    renamed over it, so terraform never reads a partially written file.
+    """
+    output = Path(output_file or Config().tf_vars_file)
+    content = dump_tf_vars_json(data)
+    tmp = output.with_name(f".{output.name}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        tmp.replace(output)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return output
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import argparse
 import logging
+import os
 import sys
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from botocore.exceptions import ClientError
@@ -18,108 +21,316 @@ from external_resources_io.terraform import (
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    from external_resources_io.terraform import ResourceChange
+    from external_resources_io.terraform import Change, ResourceChange
+
+    from hooks_lib.results import CheckRecorder
 
 from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.idle_timeout import analyze_idle_timeout
+from er_aws_rds_proxy.profiling import WORK_DIR_ENV, profile
+from er_aws_rds_proxy.rules import ENGINE_FAMILIES
 from hooks_lib.aws_api import AWSApi
+from hooks_lib.credential_cache import FileCredentialCache
+from hooks_lib.fingerprints import FingerprintStore, fingerprint
+from hooks_lib.results import ResultCollector, Severity
 
 logger = logging.getLogger(__name__)
 
+NETWORKING_ATTRIBUTES = ("vpc_subnet_ids", "vpc_security_group_ids")
+# Structured check results, written to $WORK
+RESULTS_FILE_NAME = "post-plan-results.json"
+
+
+def networking_changed(change: Change) -> bool:
+    """Whether a create, replace or update changes the proxy networking"""
+    actions = set(change.actions)
+    if Action.ActionCreate in actions and Action.ActionDelete not in actions:
+        return True
+    if not actions & {Action.ActionCreate, Action.ActionUpdate}:
+        return False
+
+    before = change.before or {}
+    after = change.after or {}
+    return any(
+        set(before.get(attr) or []) != set(after.get(attr) or [])
+        for attr in NETWORKING_ATTRIBUTES
+    )
+
 
 class RdsProxyPlanValidator:
     """The plan validator class"""
 
     def __init__(
-        self, plan: TerraformJsonPlanParser, app_interface_input: AppInterfaceInput
+        self,
+        plan: TerraformJsonPlanParser,
+        app_interface_input: AppInterfaceInput,
+        aws_api: AWSApi | None = None,
     ) -> None:
         self.plan = plan
         self.input = app_interface_input
-        self.aws_api = AWSApi(config_options={"region_name": self.input.data.region})
-        self.errors: list[str] = []
+        self.credential_cache = FileCredentialCache.from_env()
+        # sessions load the service models again, share one across validators
+        self.aws_api = aws_api or AWSApi(
+            config_options={"region_name": self.input.data.region},
+            credential_cache=self.credential_cache,
+        )
+        self.results = ResultCollector()
+        self.fingerprints = FingerprintStore.from_env()
+        self.skipped = 0
 
     @property
-    def rds_proxy_instance_updates(self) -> list[ResourceChange]:
-        """Get the rds proxy instance updates"""
+    def errors(self) -> list[str]:
+        """Messages of all errors found"""
+        return self.results.messages(Severity.ERROR)
+
+    @property
+    def warnings(self) -> list[str]:
+        """Messages of all warnings found"""
+        return self.results.messages(Severity.WARNING)
+
+    @property
+    def rds_proxy_changes(self) -> list[ResourceChange]:
+        """Get the rds proxy instance creates, replaces and updates"""
         return [
             c
             for c in self.plan.plan.resource_changes
             if c.type == "aws_db_proxy"
             and c.change
-            and Action.ActionCreate in c.change.actions
+            and {Action.ActionCreate, Action.ActionUpdate}.intersection(
+                c.change.actions
+            )
+        ]
+
+    @property
+    def rds_proxy_instance_updates(self) -> list[ResourceChange]:
+        """Get the rds proxy instance changes with networking changes"""
+        return [
+            c
+            for c in self.rds_proxy_changes
+            if c.change and networking_changed(c.change)
+        ]
+
+    @property
+    def db_instance_target_changes(self) -> list[ResourceChange]:
+        """Get the proxy target creates, replaces and updates"""
+        return [
+            c
+            for c in self.plan.plan.resource_changes
+            if c.type == "aws_db_proxy_target"
+            and c.change
+            and {Action.ActionCreate, Action.ActionUpdate}.intersection(
+                c.change.actions
+            )
         ]
 
-    def _validate_subnets_and_return_vpc_id(self, subnets: Sequence[str]) -> str | None:
+    def _validate_subnets_and_return_vpc_id(
+        self, subnets: Sequence[str], recorder: CheckRecorder
+    ) -> str | None:
         logger.info(f"Validating subnets {subnets}")
 
         vpc_ids: set[str] = set()
 
         try:
-            data = self.aws_api.get_subnets(subnets)
+            data = self.aws_api.get_subnet_refs(subnets)
         except ClientError as e:
-            self.errors.append(f"Error validating subnets: {e}")
+            recorder.error("SUBNET_LOOKUP_FAILED", f"Error validating subnets: {e}")
             return None
 
-        if missing := set(subnets).difference({s.get("SubnetId") for s in data}):
-            self.errors.append(f"Subnet(s) {missing} not found")
+        if missing := set(subnets).difference({s.subnet_id for s in data}):
+            recorder.error("SUBNET_NOT_FOUND", f"Subnet(s) {missing} not found")
             return None
 
         for subnet in data:
-            if "VpcId" not in subnet:
-                self.errors.append(
-                    f"VpcId not found for subnet {subnet.get('SubnetId')}"
+            if subnet.vpc_id is None:
+                recorder.error(
+                    "SUBNET_VPC_NOT_FOUND",
+                    f"VpcId not found for subnet {subnet.subnet_id}",
                 )
                 continue
-            vpc_ids.add(subnet["VpcId"])
+            vpc_ids.add(subnet.vpc_id)
 
         if len(vpc_ids) > 1:
-            self.errors.append("All subnets must belong to the same VPC")
+            recorder.error(
+                "SUBNETS_IN_MULTIPLE_VPCS", "All subnets must belong to the same VPC"
+            )
 
         return vpc_ids.pop() if vpc_ids else None
 
     def _validate_security_groups(
-        self, security_groups: Sequence[str], vpc_id: str
+        self, security_groups: Sequence[str], vpc_id: str, recorder: CheckRecorder
     ) -> None:
         logger.info(f"Validating security group {security_groups}")
         try:
-            data = self.aws_api.get_security_groups(security_groups)
+            data = self.aws_api.get_security_group_refs(security_groups)
         except ClientError as e:
-            self.errors.append(f"Error validating security groups: {e}")
+            recorder.error(
+                "SECURITY_GROUP_LOOKUP_FAILED",
+                f"Error validating security groups: {e}",
+            )
             return
 
-        if missing := set(security_groups).difference({s.get("GroupId") for s in data}):
-            self.errors.append(f"Security group(s) {missing} not found")
+        if missing := set(security_groups).difference({s.group_id for s in data}):
+            recorder.error(
+                "SECURITY_GROUP_NOT_FOUND", f"Security group(s) {missing} not found"
+            )
             return
 
         for sg in data:
-            if sg.get("VpcId") != vpc_id:
-                self.errors.append(
-                    f"Security group {sg.get('GroupId')} does not belong to the same VPC as the subnets"
+            if sg.vpc_id != vpc_id:
+                recorder.error(
+                    "SECURITY_GROUP_VPC_MISMATCH",
+                    f"Security group {sg.group_id} does not belong to the same VPC as the subnets",
+                )
+
+    def _validate_networking(self, change: ResourceChange) -> None:
+        if not change.change or not change.change.after:
+            return
+        after = change.change.after
+        proxy, resource = self.input.data.identifier, change.address
+        key = fingerprint(
+            account=self.input.provision.provisioner,
+            region=self.input.data.region,
+            subnets=after["vpc_subnet_ids"],
+            security_groups=after["vpc_security_group_ids"],
+        )
+        if self.fingerprints and self.fingerprints.passed(key):
+            logger.info(f"Networking of {resource} unchanged since its last validation")
+            for check in ("subnets", "security_groups"):
+                with self.results.check(proxy, check, resource) as recorder:
+                    recorder.cached = True
+            return
+
+        with self.results.check(proxy, "subnets", resource) as subnets:
+            vpc_id = self._validate_subnets_and_return_vpc_id(
+                subnets=after["vpc_subnet_ids"], recorder=subnets
+            )
+        if not vpc_id:
+            return
+        with self.results.check(proxy, "security_groups", resource) as sgs:
+            self._validate_security_groups(
+                security_groups=after["vpc_security_group_ids"],
+                vpc_id=vpc_id,
+                recorder=sgs,
+            )
+        if self.fingerprints and subnets.passed and sgs.passed:
+            self.fingerprints.record_pass(key)
+
+    def _validate_db_instance(
+        self, db_instance_identifier: str, recorder: CheckRecorder
+    ) -> None:
+        logger.info(f"Validating DB instance {db_instance_identifier}")
+        try:
+            instance = self.aws_api.get_db_instance_ref(db_instance_identifier)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "DBInstanceNotFound":
+                recorder.error(
+                    "DB_INSTANCE_NOT_FOUND",
+                    f"DB instance {db_instance_identifier} not found",
                 )
+            else:
+                recorder.error(
+                    "DB_INSTANCE_LOOKUP_FAILED", f"Error validating DB instance: {e}"
+                )
+            return
+
+        engine_family = self.input.data.engine_family
+        if instance.engine not in ENGINE_FAMILIES[engine_family].engines:
+            recorder.error(
+                "DB_INSTANCE_ENGINE_MISMATCH",
+                f"DB instance {db_instance_identifier} engine {instance.engine} does not match engine_family {engine_family}",
+            )
+
+    @staticmethod
+    def _validate_iam_auth(change: ResourceChange, recorder: CheckRecorder) -> None:
+        after = (change.change and change.change.after) or {}
+        iam_auth = {
+            auth.get("iam_auth") or "DISABLED" for auth in after.get("auth") or []
+        } - {"DISABLED"}
+        if iam_auth and not after.get("require_tls"):
+            recorder.error(
+                "IAM_AUTH_WITHOUT_TLS",
+                f"require_tls must be enabled to use iam_auth {', '.join(sorted(iam_auth))}",
+            )
+
+    def _validate_debug_logging(self, recorder: CheckRecorder) -> None:
+        data = self.input.data
+        if not data.debug_logging or data.tags.get("environment") != "production":
+            return
+
+        if data.debug_logging_expires_at is None:
+            recorder.error(
+                "DEBUG_LOGGING_WITHOUT_EXPIRY",
+                "debug_logging_expires_at must be set to enable debug_logging on a production proxy",
+            )
+            return
+        recorder.warning(
+            "DEBUG_LOGGING_ENABLED",
+            f"debug_logging is enabled on a production proxy until {data.debug_logging_expires_at.isoformat()}",
+        )
+
+    def _validate_idle_client_timeout(self, recorder: CheckRecorder) -> None:
+        for warning in analyze_idle_timeout(self.input.data).warnings:
+            recorder.warning("IDLE_CLIENT_TIMEOUT", warning)
 
     def validate(self) -> bool:
         """Validate method"""
-        for u in self.rds_proxy_instance_updates:
-            if not u.change or not u.change.after:
-                continue
+        updates = self.rds_proxy_instance_updates
+        self.skipped = len(self.rds_proxy_changes) - len(updates)
+        if self.skipped:
+            logger.info(
+                f"Skipping {self.skipped} rds proxy change(s) without networking changes"
+            )
+
+        for u in updates:
+            self._validate_networking(u)
+
+        identifier = self.input.data.identifier
+        for change in self.rds_proxy_changes:
+            with self.results.check(identifier, "iam_auth", change.address) as recorder:
+                self._validate_iam_auth(change, recorder)
 
-            if vpc_id := self._validate_subnets_and_return_vpc_id(
-                subnets=u.change.after["vpc_subnet_ids"]
-            ):
-                self._validate_security_groups(
-                    security_groups=u.change.after["vpc_security_group_ids"],
-                    vpc_id=vpc_id,
+        for target in self.db_instance_target_changes:
+            if not target.change or not target.change.after:
+                continue
+            with self.results.check(
+                identifier, "db_instance", target.address
+            ) as recorder:
+                self._validate_db_instance(
+                    target.change.after["db_instance_identifier"], recorder
                 )
+        with self.results.check(identifier, "debug_logging") as recorder:
+            self._validate_debug_logging(recorder)
+        with self.results.check(identifier, "idle_client_timeout") as recorder:
+            self._validate_idle_client_timeout(recorder)
         return not self.errors
 
 
 if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(description="RDS Proxy plan validation")
+    parser.add_argument(
+        "--profile", action="store_true", help="Write profiling output to $WORK"
+    )
+    args = parser.parse_args()
+
     setup_logging()
-    app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
-    logger.info("Running RDS Proxy terraform plan validation")
-    plan = TerraformJsonPlanParser(plan_path=Config().plan_file_json)
-    validator = RdsProxyPlanValidator(plan, app_interface_input)
-    if not validator.validate():
-        logger.error(validator.errors)
-        sys.exit(1)
-
-    logger.info("Validation ended succesfully")
+    with profile("post-plan", enabled=args.profile):
+        app_interface_input = parse_model(AppInterfaceInput, read_input_from_file())
+        logger.info("Running RDS Proxy terraform plan validation")
+        plan = TerraformJsonPlanParser(plan_path=Config().plan_file_json)
+        validator = RdsProxyPlanValidator(plan, app_interface_input)
+        valid = validator.validate()
+        # findings are only reported here, not logged again
+        sys.stdout.write(validator.results.to_text())
+        if work_dir := os.environ.get(WORK_DIR_ENV):
+            Path(work_dir, RESULTS_FILE_NAME).write_text(
+                validator.results.to_json(), encoding="utf-8"
+            )
+        if validator.credential_cache:
+            validator.credential_cache.log_stats()
+        if validator.fingerprints:
+            validator.fingerprints.log_stats()
+        if not valid:
+            logger.error(f"Validation failed with {len(validator.errors)} error(s)")
+            sys.exit(1)
+
+        logger.info("Validation ended succesfully")
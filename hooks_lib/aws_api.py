@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from functools import cached_property
+from typing import TYPE_CHECKING, NamedTuple
 
 from boto3 import Session
 from botocore.config import Config as BotocoreConfig
 
+from hooks_lib.results import count_api_call
+
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
     from typing import Any
@@ -12,27 +15,111 @@ if TYPE_CHECKING:
     from mypy_boto3_ec2.client import EC2Client
     from mypy_boto3_ec2.type_defs import SecurityGroupTypeDef, SubnetTypeDef
 
+    from hooks_lib.credential_cache import FileCredentialCache
+
+
+class SubnetRef(NamedTuple):
+    """Slim subnet representation with only the fields the validator needs"""
+
+    subnet_id: str
+    vpc_id: str | None
+
+
+class SecurityGroupRef(NamedTuple):
+    """Slim security group representation with only the fields the validator needs"""
+
+    group_id: str
+    vpc_id: str | None
+
+
+class DBInstanceRef(NamedTuple):
+    """Slim DB instance representation with only the fields the validator needs"""
+
+    db_instance_identifier: str
+    engine: str
+
 
 class AWSApi:
     """AWS Api Class"""
 
-    def __init__(self, config_options: Mapping[str, Any]) -> None:
-        self.session = Session()
+    def __init__(
+        self,
+        config_options: Mapping[str, Any],
+        endpoint_url: str | None = None,
+        credential_cache: FileCredentialCache | None = None,
+    ) -> None:
+        self.session = (
+            Session(botocore_session=credential_cache.session())
+            if credential_cache
+            else Session()
+        )
+        # attribute API calls to the running check, see results.ResultCollector
+        self.session.events.register("before-call", count_api_call)
         self.config = BotocoreConfig(**config_options)
+        self.endpoint_url = endpoint_url
+        # VPC ids repeat across thousands of subnets and security groups,
+        # keep a single string instance per id
+        self._vpc_ids: dict[str, str] = {}
 
-    @property
+    @cached_property
     def ec2_client(self) -> EC2Client:
-        """Gets a boto EC2 client"""
-        return self.session.client("ec2", config=self.config)
+        """Gets the boto EC2 client, created on first use"""
+        return self.session.client(
+            "ec2", config=self.config, endpoint_url=self.endpoint_url
+        )
+
+    @cached_property
+    def rds_client(self) -> Any:  # ruff: ignore[any-type]
+        """Gets the boto RDS client, created on first use, untyped without the rds stubs"""
+        return self.session.client(
+            "rds", config=self.config, endpoint_url=self.endpoint_url
+        )
+
+    def intern_vpc_id(self, vpc_id: str | None) -> str | None:
+        """Return the shared instance of a VPC id"""
+        if vpc_id is None:
+            return None
+        return self._vpc_ids.setdefault(vpc_id, vpc_id)
 
     def get_subnets(self, subnets: Sequence[str]) -> list[SubnetTypeDef]:
         """Retrieve subnet list"""
         data = self.ec2_client.describe_subnets(SubnetIds=subnets)
         return data["Subnets"]
 
+    def get_subnet_refs(self, subnets: Sequence[str]) -> list[SubnetRef]:
+        """Retrieve subnet list as slim references"""
+        return [
+            SubnetRef(
+                subnet_id=s["SubnetId"], vpc_id=self.intern_vpc_id(s.get("VpcId"))
+            )
+            for s in self.get_subnets(subnets)
+        ]
+
     def get_security_groups(
         self, security_groups: Sequence[str]
     ) -> list[SecurityGroupTypeDef]:
         """Retrieve security group list"""
         data = self.ec2_client.describe_security_groups(GroupIds=security_groups)
         return data["SecurityGroups"]
+
+    def get_security_group_refs(
+        self, security_groups: Sequence[str]
+    ) -> list[SecurityGroupRef]:
+        """Retrieve security group list as slim references"""
+        return [
+            SecurityGroupRef(
+                group_id=sg["GroupId"], vpc_id=self.intern_vpc_id(sg.get("VpcId"))
+            )
+            for sg in self.get_security_groups(security_groups)
+        ]
+
+    def get_db_instance_ref(self, db_instance_identifier: str) -> DBInstanceRef:
+        """Retrieve a DB instance as slim reference, raises DBInstanceNotFound"""
+        data = self.rds_client.describe_db_instances(
+            DBInstanceIdentifier=db_instance_identifier
+        )
+        instance = data["DBInstances"][0]
+        return DBInstanceRef(
+            db_instance_identifier=instance["DBInstanceIdentifier"],
+            engine=instance["Engine"],
+        )
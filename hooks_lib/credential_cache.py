@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from botocore.session import Session as BotocoreSession
+
+from er_aws_rds_proxy.profiling import WORK_DIR_ENV
+from hooks_lib.json_file import LockedJSONFile
+
+if TYPE_CHECKING:
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Shared by every hook run of a job, in $WORK
+CACHE_FILE_NAME = "aws-credential-cache.json"
+# Providers fetching temporary credentials, they look up `cache` before calling STS
+CACHING_PROVIDERS = ("assume-role", "assume-role-with-web-identity", "sso")
+# Credentials expiring sooner are fetched again (botocore's own expiry window)
+REFRESH_MARGIN = timedelta(minutes=15)
+
+
+def _serialize(obj: object) -> str:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FileCredentialCache:
+    """Temporary AWS credentials persisted to a JSON file until near expiry.
+
+    Dict-like, as expected by botocore's assume role, web identity and SSO
+    credential providers. The file is locked while read or written, so
+    concurrent hook processes share the credentials instead of calling STS
+    each.
+    """
+
+    def __init__(self, path: Path, refresh_margin: timedelta = REFRESH_MARGIN) -> None:
+        self.path = path
+        self.file = LockedJSONFile(path)
+        self.refresh_margin = refresh_margin
+        self.hits = 0
+        self.misses = 0
+        self.sts_calls = 0
+
+    @classmethod
+    def from_env(cls) -> FileCredentialCache | None:
+        """Cache in the job work dir, None when $WORK is not set"""
+        if work_dir := os.environ.get(WORK_DIR_ENV):
+            return cls(Path(work_dir) / CACHE_FILE_NAME)
+        return None
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _fresh(self, entry: dict[str, Any]) -> bool:
+        value = entry.get("Credentials", {}).get("Expiration")
+        if not isinstance(value, str):
+            return False
+        try:
+            expiration = datetime.fromisoformat(value)
+        except ValueError:
+            return False
+        return expiration - datetime.now(UTC) > self.refresh_margin
+
+    def __contains__(self, key: object) -> bool:
+        """Whether fresh credentials are cached for key"""
+        entry = self.file.read().get(str(key))
+        if entry is not None and self._fresh(entry):
+            return True
+        self.misses += 1
+        return False
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        """Cached credentials of key"""
+        entry = self.file.read()[key]
+        self.hits += 1
+        return entry
+
+    def __setitem__(self, key: str, value: dict[str, Any]) -> None:
+        """Cache credentials, dropping entries close to expiry"""
+
+        def update(entries: dict[str, Any]) -> dict[str, Any]:
+            return {k: v for k, v in entries.items() if self._fresh(v)} | {key: value}
+
+        self.file.update(update, default=_serialize)
+
+    def _count_sts_call(self, **_: Any) -> None:  # ruff: ignore[any-type]
+        self.sts_calls += 1
+
+    def install(self, session: BotocoreSession) -> BotocoreSession:
+        """Use the cache for the temporary credentials of a botocore session"""
+        resolver = session.get_component("credential_provider")
+        for name in CACHING_PROVIDERS:
+            if provider := resolver.get_provider(name):
+                provider.cache = self
+        session.register("before-call.sts", self._count_sts_call)
+        return session
+
+    def session(self) -> BotocoreSession:
+        """A new botocore session using the cache"""
+        return self.install(BotocoreSession())
+
+    def log_stats(self) -> None:
+        """Log hit rate and STS calls"""
+        logger.info(
+            f"Credential cache: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({self.hit_rate:.0%} hit rate), {self.sts_calls} STS call(s)"
+        )
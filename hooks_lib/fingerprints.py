@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from er_aws_rds_proxy.profiling import WORK_DIR_ENV
+from hooks_lib.json_file import LockedJSONFile
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STORE_FILE_NAME = "validation-fingerprints.json"
+# Subnets and security groups rarely change, but can be deleted at any time
+DEFAULT_TTL = timedelta(hours=1)
+
+
+def fingerprint(
+    account: str,
+    region: str,
+    subnets: Sequence[str],
+    security_groups: Sequence[str],
+) -> str:
+    """Hash of everything the networking validation of a proxy depends on"""
+    content = json.dumps(
+        [account, region, sorted(subnets), sorted(security_groups)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class FingerprintStore:
+    """Fingerprints of successfully validated proxy changes, kept for a TTL.
+
+    Shared by every hook run of a job through a locked JSON file, so
+    re-plans of an unchanged proxy skip the AWS lookups.
+    """
+
+    def __init__(self, path: Path, ttl: timedelta = DEFAULT_TTL) -> None:
+        self.file = LockedJSONFile(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> FingerprintStore | None:
+        """Store in the job work dir, None when $WORK is not set"""
+        if work_dir := os.environ.get(WORK_DIR_ENV):
+            return cls(Path(work_dir) / STORE_FILE_NAME)
+        return None
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the store"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _fresh(self, validated_at: Any) -> bool:  # ruff: ignore[any-type]
+        return (
+            isinstance(validated_at, int | float)
+            and time.time() - validated_at < self.ttl.total_seconds()
+        )
+
+    def passed(self, key: str) -> bool:
+        """Whether key was validated successfully within the TTL"""
+        if self._fresh(self.file.read().get(key)):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def record_pass(self, key: str) -> None:
+        """Remember a successful validation, dropping expired ones"""
+        now = time.time()
+        self.file.update(
+            lambda entries: (
+                {k: v for k, v in entries.items() if self._fresh(v)} | {key: now}
+            )
+        )
+
+    def log_stats(self) -> None:
+        """Log the cache hit ratio"""
+        logger.info(
+            f"Validation fingerprints: {self.hits} hit(s), {self.misses} miss(es) "
+            f"({self.hit_ratio:.0%} hit ratio)"
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class LockedJSONFile:
+    """A JSON object in a file shared between processes.
+
+    Reads take a shared and updates an exclusive lock on a sidecar lock file.
+    Updates replace the file atomically, it is only accessible by its owner.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @contextmanager
+    def _locked(self, operation: int) -> Generator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, operation)
+            yield
+        finally:
+            os.close(fd)
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"Ignoring corrupt file {self.path}")
+            return {}
+
+    def read(self) -> dict[str, Any]:
+        """Current content, empty when missing or corrupt"""
+        with self._locked(fcntl.LOCK_SH):
+            return self._load()
+
+    def update(
+        self,
+        update: Callable[[dict[str, Any]], dict[str, Any]],
+        default: Callable[[Any], Any] | None = None,
+    ) -> None:
+        """Replace the content with update(content), default serializes unknown types"""
+        with self._locked(fcntl.LOCK_EX):
+            content = json.dumps(update(self._load()), default=default)
+            tmp = self.path.with_suffix(".tmp")
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            tmp.replace(self.path)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from typing import Any
+
+
+class Severity(StrEnum):
+    """Severity of a finding, errors fail the validation"""
+
+    ERROR = "error"
+    WARNING = "warning"
+
+
+class Finding(BaseModel):
+    """A problem reported by a check"""
+
+    code: str = Field(
+        description="Stable identifier of the problem, e.g. SUBNET_NOT_FOUND"
+    )
+    severity: Severity
+    message: str
+
+
+class CheckResult(BaseModel):
+    """Outcome of one check of one proxy"""
+
+    proxy: str = Field(description="Proxy identifier")
+    check: str
+    resource: str | None = Field(
+        default=None, description="Terraform address of the checked resource"
+    )
+    duration: float = Field(description="Seconds spent in the check")
+    api_calls: int = Field(description="AWS API calls made by the check")
+    cached: bool = Field(
+        default=False, description="Passed in a previous validation, not run again"
+    )
+    findings: list[Finding] = []
+
+    @property
+    def passed(self) -> bool:
+        """Whether the check found no errors"""
+        return all(f.severity != Severity.ERROR for f in self.findings)
+
+
+class ValidationReport(BaseModel):
+    """All check results of a validation run"""
+
+    results: list[CheckResult]
+
+
+class CheckRecorder:
+    """Collects the findings and API calls of a running check"""
+
+    def __init__(self) -> None:
+        self.findings: list[Finding] = []
+        self.api_calls = 0
+        self.cached = False
+
+    @property
+    def passed(self) -> bool:
+        """Whether no errors were recorded so far"""
+        return all(f.severity != Severity.ERROR for f in self.findings)
+
+    def error(self, code: str, message: str) -> None:
+        """Record an error"""
+        self.findings.append(
+            Finding(code=code, severity=Severity.ERROR, message=message)
+        )
+
+    def warning(self, code: str, message: str) -> None:
+        """Record a warning"""
+        self.findings.append(
+            Finding(code=code, severity=Severity.WARNING, message=message)
+        )
+
+
+# Check running in the current thread or task
+_current_check: ContextVar[CheckRecorder | None] = ContextVar(
+    "current_check", default=None
+)
+
+
+def count_api_call(**_: Any) -> None:  # ruff: ignore[any-type]
+    """botocore `before-call` handler attributing the call to the running check"""
+    if recorder := _current_check.get():
+        recorder.api_calls += 1
+
+
+class ResultCollector:
+    """Thread and task safe aggregator of check results.
+
+    Checks may run concurrently, results are ordered by proxy, check and
+    resource so the output does not depend on scheduling.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: list[CheckResult] = []
+
+    @contextmanager
+    def check(
+        self, proxy: str, check: str, resource: str | None = None
+    ) -> Generator[CheckRecorder]:
+        """Time a check and count its API calls while it records findings"""
+        recorder = CheckRecorder()
+        token = _current_check.set(recorder)
+        start = time.perf_counter()
+        try:
+            yield recorder
+        finally:
+            duration = time.perf_counter() - start
+            _current_check.reset(token)
+            self.add(
+                CheckResult(
+                    proxy=proxy,
+                    check=check,
+                    resource=resource,
+                    duration=duration,
+                    api_calls=recorder.api_calls,
+                    cached=recorder.cached,
+                    findings=recorder.findings,
+                )
+            )
+
+    def add(self, result: CheckResult) -> None:
+        """Add the result of a check"""
+        with self._lock:
+            self._results.append(result)
+
+    @property
+    def results(self) -> list[CheckResult]:
+        """Check results in deterministic order"""
+        with self._lock:
+            results = list(self._results)
+        return sorted(results, key=lambda r: (r.proxy, r.check, r.resource or ""))
+
+    def messages(self, severity: Severity) -> list[str]:
+        """Messages of all findings with a severity"""
+        return [
+            f.message
+            for r in self.results
+            for f in r.findings
+            if f.severity == severity
+        ]
+
+    def report(self) -> ValidationReport:
+        """All results as a model"""
+        return ValidationReport(results=self.results)
+
+    def to_json(self) -> str:
+        """All results as JSON"""
+        return self.report().model_dump_json(indent=2)
+
+    def to_text(self) -> str:
+        """All results as human readable text, one line per check and finding"""
+        lines = []
+        for r in self.results:
+            target = f"{r.proxy} {r.resource}" if r.resource else r.proxy
+            status = "passed" if r.passed else "FAILED"
+            lines.append(
+                f"{target} {r.check}: {status} (cached)"
+                if r.cached
+                else f"{target} {r.check}: {status} "
+                f"({r.duration * 1000:.1f}ms, {r.api_calls} API call(s))"
+            )
+            lines.extend(
+                f"  {f.severity.upper()} {f.code}: {f.message}" for f in r.findings
+            )
+        return "\n".join(lines) + "\n" if lines else ""
@@ -1,6 +1,65 @@
 locals {
   partition  = data.aws_partition.current.partition
   account_id = data.aws_caller_identity.current.account_id
+
+  # prx-..., part of the rds-db:connect resource ARN and used to build IAM auth tokens
+  proxy_resource_id = element(split(":", aws_db_proxy.this.arn), 6)
+  # database users consumers may connect as with an IAM auth token
+  iam_auth_users = distinct([
+    for auth in var.auth : coalesce(auth.username, "*")
+    if coalesce(auth.iam_auth, "DISABLED") != "DISABLED"
+  ])
+
+  # single metric alarms, keyed by alarm name suffix
+  metric_alarms = var.alarms == null ? {} : {
+    for k, v in {
+      borrow-latency = {
+        metric_name = "DatabaseConnectionsBorrowLatency"
+        statistic   = "Average"
+        threshold   = var.alarms.borrow_latency_threshold
+        description = "Time to borrow a database connection from the pool (microseconds)"
+      }
+      client-connections = {
+        metric_name = "ClientConnections"
+        statistic   = "Maximum"
+        threshold   = var.alarms.client_connections_threshold
+        description = "Client connections to the proxy"
+      }
+      query-response-latency = {
+        metric_name = "QueryDatabaseResponseLatency"
+        statistic   = "Average"
+        threshold   = var.alarms.query_response_latency_threshold
+        description = "Time the database takes to answer queries (microseconds)"
+      }
+    } : k => v if v.threshold != null
+  }
+
+  # percentage alarms, metric * 100 / total
+  ratio_alarms = var.alarms == null ? {} : {
+    for k, v in {
+      pool-saturation = {
+        metric_name = "DatabaseConnections"
+        total_name  = "MaxDatabaseConnectionsAllowed"
+        threshold   = var.alarms.pool_saturation_threshold
+        description = "Database connections in use, percentage of the pool size"
+      }
+      session-pinning = {
+        metric_name = "DatabaseConnectionsCurrentlySessionPinned"
+        total_name  = "DatabaseConnections"
+        threshold   = var.alarms.session_pinned_threshold
+        description = "Database connections pinned to a client session, percentage of database connections"
+      }
+    } : k => v if v.threshold != null
+  }
+
+  dashboard_metrics = [
+    "ClientConnections",
+    "DatabaseConnections",
+    "MaxDatabaseConnectionsAllowed",
+    "DatabaseConnectionsCurrentlySessionPinned",
+    "DatabaseConnectionsBorrowLatency",
+    "QueryDatabaseResponseLatency",
+  ]
 }
 
 provider "aws" {
@@ -74,6 +133,98 @@ resource "aws_cloudwatch_log_group" "this" {
   tags = var.tags
 }
 
+resource "aws_cloudwatch_metric_alarm" "metric" {
+  for_each = local.metric_alarms
+
+  alarm_name          = "${var.identifier}-${each.key}"
+  alarm_description   = each.value.description
+  namespace           = "AWS/RDS"
+  metric_name         = each.value.metric_name
+  statistic           = each.value.statistic
+  dimensions          = { ProxyName = aws_db_proxy.this.name }
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = each.value.threshold
+  period              = var.alarms.period
+  evaluation_periods  = var.alarms.evaluation_periods
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = var.alarms.alarm_actions
+  ok_actions          = var.alarms.alarm_actions
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_metric_alarm" "ratio" {
+  for_each = local.ratio_alarms
+
+  alarm_name          = "${var.identifier}-${each.key}"
+  alarm_description   = each.value.description
+  comparison_operator = "GreaterThanThreshold"
+  threshold           = each.value.threshold
+  evaluation_periods  = var.alarms.evaluation_periods
+  treat_missing_data  = "notBreaching"
+  alarm_actions       = var.alarms.alarm_actions
+  ok_actions          = var.alarms.alarm_actions
+
+  metric_query {
+    id          = "ratio"
+    expression  = "IF(total > 0, 100 * metric / total, 0)"
+    label       = "${each.value.metric_name} (%)"
+    return_data = true
+  }
+
+  metric_query {
+    id = "metric"
+    metric {
+      namespace   = "AWS/RDS"
+      metric_name = each.value.metric_name
+      dimensions  = { ProxyName = aws_db_proxy.this.name }
+      period      = var.alarms.period
+      stat        = "Maximum"
+    }
+  }
+
+  metric_query {
+    id = "total"
+    metric {
+      namespace   = "AWS/RDS"
+      metric_name = each.value.total_name
+      dimensions  = { ProxyName = aws_db_proxy.this.name }
+      period      = var.alarms.period
+      stat        = "Maximum"
+    }
+  }
+
+  tags = var.tags
+}
+
+resource "aws_cloudwatch_dashboard" "this" {
+  count = var.alarms != null && try(var.alarms.dashboard, false) ? 1 : 0
+
+  dashboard_name = "rds-proxy-${var.identifier}"
+  dashboard_body = jsonencode({
+    widgets = [
+      for idx, metric in local.dashboard_metrics : {
+        type   = "metric"
+        x      = (idx % 2) * 12
+        y      = floor(idx / 2) * 6
+        width  = 12
+        height = 6
+        properties = {
+          title   = metric
+          region  = var.region
+          view    = "timeSeries"
+          stat    = "Average"
+          period  = var.alarms.period
+          metrics = [["AWS/RDS", metric, "ProxyName", aws_db_proxy.this.name]]
+          annotations = {
+            horizontal = [for k, v in local.metric_alarms : { label = k, value = v.threshold } if v.metric_name == metric]
+          }
+        }
+      }
+    ]
+  })
+}
+
 resource "aws_iam_role" "this" {
   name = var.identifier
 
@@ -126,3 +277,19 @@ resource "aws_iam_role_policy" "this" {
   policy = data.aws_iam_policy_document.this.json
   role   = aws_iam_role.this.id
 }
+
+# policy consumers attach to connect with IAM auth, rendered as output only
+data "aws_iam_policy_document" "connect" {
+  count = length(local.iam_auth_users) > 0 ? 1 : 0
+
+  statement {
+    sid     = "ConnectProxy"
+    effect  = "Allow"
+    actions = ["rds-db:connect"]
+
+    resources = [
+      for user in local.iam_auth_users :
+      "arn:${local.partition}:rds-db:${var.region}:${local.account_id}:dbuser:${local.proxy_resource_id}/${user}"
+    ]
+  }
+}
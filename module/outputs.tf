@@ -8,6 +8,16 @@ output "proxy_arn" {
   value       = aws_db_proxy.this.arn
 }
 
+output "proxy_resource_id" {
+  description = "The resource ID of the proxy, used to build IAM auth tokens"
+  value       = local.proxy_resource_id
+}
+
+output "iam_connect_policy" {
+  description = "IAM policy allowing consumers to connect with IAM auth, null when IAM auth is disabled"
+  value       = one(data.aws_iam_policy_document.connect[*].json)
+}
+
 output "proxy_endpoint" {
   description = "The endpoint that you can use to connect to the proxy"
   value       = aws_db_proxy.this.endpoint
@@ -1,3 +1,21 @@
+# Do not generate this variable from the model, as it is not mark
+# values with None default as optional
+variable "alarms" {
+  type = object({
+    alarm_actions                    = optional(list(string), [])
+    period                           = optional(number, 60)
+    evaluation_periods               = optional(number, 5)
+    borrow_latency_threshold         = optional(number)
+    client_connections_threshold     = optional(number)
+    pool_saturation_threshold        = optional(number)
+    session_pinned_threshold         = optional(number)
+    query_response_latency_threshold = optional(number)
+    dashboard                        = optional(bool, true)
+  })
+  default     = null
+  description = "CloudWatch alarms and dashboard"
+}
+
 # Do not generate this variable from the model, as it is not mark
 # values with None default as optional
 variable "auth" {
@@ -11,6 +29,23 @@ variable "auth" {
   }))
 }
 
+# Do not generate this variable from the model, as it is not mark
+# values with None default as optional
+variable "client_pools" {
+  type = list(object({
+    name               = string
+    replicas           = optional(number, 1)
+    min_pool_size      = optional(number, 0)
+    max_pool_size      = number
+    keepalive_interval = optional(number)
+    idle_timeout       = optional(number)
+    max_lifetime       = optional(number)
+    ephemeral          = optional(bool, false)
+  }))
+  default     = []
+  description = "Client connection pool settings per consumer"
+}
+
 variable "connection_borrow_timeout" {
   type        = number
   default     = null
@@ -28,6 +63,12 @@ variable "debug_logging" {
   description = "Enable detailed SQL statement logging"
 }
 
+variable "debug_logging_expires_at" {
+  type        = string
+  default     = null
+  description = "Time after which debug_logging is turned off"
+}
+
 variable "engine_family" {
   type        = string
   default     = "POSTGRESQL"
@@ -0,0 +1,291 @@
+"""Local stand-in for the EC2, RDS and STS query APIs used by the hooks.
+
+It answers DescribeSubnets, DescribeSecurityGroups, DescribeDBInstances and
+AssumeRole over HTTP, so real boto clients (serialization, retries, connection reuse)
+can be exercised offline by pointing them at `AWSStandIn.endpoint_url`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Self
+from urllib.parse import parse_qs
+from xml.sax.saxutils import escape
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+EC2_XMLNS = "http://ec2.amazonaws.com/doc/2016-11-15/"
+RDS_XMLNS = "http://rds.amazonaws.com/doc/2014-10-31/"
+EC2_ACTIONS = {"DescribeSubnets", "DescribeSecurityGroups"}
+RDS_ACTIONS = {"DescribeDBInstances"}
+STS_XMLNS = "https://sts.amazonaws.com/doc/2011-06-15/"
+STS_ACTIONS = {"AssumeRole"}
+
+
+@dataclass(frozen=True)
+class InjectedError:
+    """An error returned instead of the regular response"""
+
+    code: str
+    status: int = 400
+    message: str = "Injected error"
+
+
+class ApiError(Exception):
+    """Error raised by the action handlers"""
+
+    def __init__(self, error: InjectedError) -> None:
+        super().__init__(error.code)
+        self.error = error
+
+
+@dataclass
+class AWSStandIn:
+    """In-memory EC2/RDS inventory served over HTTP.
+
+    Fault injection:
+      latency: seconds to sleep before answering every request
+      throttle_every: throttle every Nth request (0 disables throttling)
+      errors: action name -> error returned for every call to that action
+
+    AssumeRole returns credentials expiring after credentials_ttl.
+    """
+
+    subnets: dict[str, str] = field(default_factory=dict)
+    security_groups: dict[str, str] = field(default_factory=dict)
+    db_instances: dict[str, str] = field(default_factory=dict)
+    credentials_ttl: timedelta = timedelta(hours=1)
+    latency: float = 0.0
+    throttle_every: int = 0
+    errors: dict[str, InjectedError] = field(default_factory=dict)
+
+    requests: Counter[str] = field(default_factory=Counter, init=False)
+    throttled: int = field(default=0, init=False)
+    connections: int = field(default=0, init=False)
+
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _server: ThreadingHTTPServer | None = field(default=None, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+
+    @property
+    def endpoint_url(self) -> str:
+        """URL to pass as boto `endpoint_url`"""
+        if self._server is None:
+            raise RuntimeError("stand-in server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> None:
+        """Start serving on a random local port"""
+        handler = type("Handler", (_Handler,), {"stand_in": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = self._thread = None
+
+    def __enter__(self) -> Self:
+        """Start the server"""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop the server"""
+        self.stop()
+
+    def handle(self, action: str, params: dict[str, list[str]]) -> str:
+        """Answer one API call, returns the XML body or raises ApiError"""
+        with self._lock:
+            self.requests[action] += 1
+            total = self.requests.total()
+            throttle = self.throttle_every and total % self.throttle_every == 0
+            if throttle:
+                self.throttled += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttle:
+            raise ApiError(
+                InjectedError(code="RequestLimitExceeded", status=503)
+                if action in EC2_ACTIONS
+                else InjectedError(code="Throttling", status=400)
+            )
+        if error := self.errors.get(action):
+            raise ApiError(error)
+        match action:
+            case "DescribeSubnets":
+                return self._describe_subnets(params)
+            case "DescribeSecurityGroups":
+                return self._describe_security_groups(params)
+            case "DescribeDBInstances":
+                return self._describe_db_instances(params)
+            case "AssumeRole":
+                return self._assume_role(params)
+        raise ApiError(InjectedError(code="InvalidAction", message=f"Unknown {action}"))
+
+    def _describe_subnets(self, params: dict[str, list[str]]) -> str:
+        ids = _indexed(params, "SubnetId") or list(self.subnets)
+        if missing := [i for i in ids if i not in self.subnets]:
+            raise ApiError(
+                InjectedError(
+                    code="InvalidSubnetID.NotFound",
+                    message=f"The subnet ID '{', '.join(missing)}' does not exist",
+                )
+            )
+        items = "".join(
+            f"<item><subnetId>{escape(i)}</subnetId><vpcId>{escape(self.subnets[i])}</vpcId></item>"
+            for i in ids
+        )
+        return _ec2_response("DescribeSubnets", f"<subnetSet>{items}</subnetSet>")
+
+    def _describe_security_groups(self, params: dict[str, list[str]]) -> str:
+        ids = _indexed(params, "GroupId") or list(self.security_groups)
+        if missing := [i for i in ids if i not in self.security_groups]:
+            raise ApiError(
+                InjectedError(
+                    code="InvalidGroup.NotFound",
+                    message=f"The security group '{', '.join(missing)}' does not exist",
+                )
+            )
+        items = "".join(
+            f"<item><groupId>{escape(i)}</groupId><vpcId>{escape(self.security_groups[i])}</vpcId></item>"
+            for i in ids
+        )
+        return _ec2_response(
+            "DescribeSecurityGroups", f"<securityGroupInfo>{items}</securityGroupInfo>"
+        )
+
+    def _describe_db_instances(self, params: dict[str, list[str]]) -> str:
+        ids = params.get("DBInstanceIdentifier") or list(self.db_instances)
+        if missing := [i for i in ids if i not in self.db_instances]:
+            raise ApiError(
+                InjectedError(
+                    code="DBInstanceNotFound",
+                    status=404,
+                    message=f"DBInstance {missing[0]} not found.",
+                )
+            )
+        items = "".join(
+            "<DBInstance>"
+            f"<DBInstanceIdentifier>{escape(i)}</DBInstanceIdentifier>"
+            f"<Engine>{escape(self.db_instances[i])}</Engine>"
+            "<DBInstanceStatus>available</DBInstanceStatus>"
+            "</DBInstance>"
+            for i in ids
+        )
+        return (
+            f'<DescribeDBInstancesResponse xmlns="{RDS_XMLNS}">'
+            "<DescribeDBInstancesResult>"
+            f"<DBInstances>{items}</DBInstances>"
+            "</DescribeDBInstancesResult>"
+            f"<ResponseMetadata><RequestId>{uuid.uuid4()}</RequestId></ResponseMetadata>"
+            "</DescribeDBInstancesResponse>"
+        )
+
+    def _assume_role(self, params: dict[str, list[str]]) -> str:
+        role_arn = params["RoleArn"][0]
+        session_name = params["RoleSessionName"][0]
+        expiration = datetime.now(UTC) + self.credentials_ttl
+        return (
+            f'<AssumeRoleResponse xmlns="{STS_XMLNS}">'
+            "<AssumeRoleResult><Credentials>"
+            f"<AccessKeyId>ASIA{uuid.uuid4().hex[:16].upper()}</AccessKeyId>"
+            f"<SecretAccessKey>{uuid.uuid4().hex}</SecretAccessKey>"
+            f"<SessionToken>{uuid.uuid4().hex}</SessionToken>"
+            f"<Expiration>{expiration.strftime('%Y-%m-%dT%H:%M:%SZ')}</Expiration>"
+            "</Credentials><AssumedRoleUser>"
+            f"<Arn>{escape(role_arn)}/{escape(session_name)}</Arn>"
+            f"<AssumedRoleId>AROA0000000000000000:{escape(session_name)}</AssumedRoleId>"
+            "</AssumedRoleUser></AssumeRoleResult>"
+            f"<ResponseMetadata><RequestId>{uuid.uuid4()}</RequestId></ResponseMetadata>"
+            "</AssumeRoleResponse>"
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # keep-alive, so connection reuse by the client is observable
+    protocol_version = "HTTP/1.1"
+    # send headers and body in a single write, no Nagle/delayed-ACK stalls
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    stand_in: AWSStandIn
+
+    def setup(self) -> None:
+        super().setup()
+        with self.stand_in._lock:  # ruff: ignore[private-member-access]
+            self.stand_in.connections += 1
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        params = parse_qs(self.rfile.read(length).decode())
+        action = params.get("Action", [""])[0]
+        try:
+            status, body = 200, self.stand_in.handle(action, params)
+        except ApiError as e:
+            status, body = e.error.status, _error_response(action, e.error)
+        payload = f'<?xml version="1.0" encoding="UTF-8"?>\n{body}'.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml;charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: object) -> None:  # ruff: ignore[builtin-argument-shadowing]
+        pass
+
+
+def _indexed(params: dict[str, list[str]], name: str) -> list[str]:
+    """Collect `Name.1`, `Name.2`, ... query list members in order"""
+    members = (
+        (int(k.removeprefix(f"{name}.")), v[0])
+        for k, v in params.items()
+        if k.startswith(f"{name}.")
+    )
+    return [v for _, v in sorted(members)]
+
+
+def _ec2_response(action: str, content: str) -> str:
+    return (
+        f'<{action}Response xmlns="{EC2_XMLNS}">'
+        f"<requestId>{uuid.uuid4()}</requestId>{content}"
+        f"</{action}Response>"
+    )
+
+
+def _error_response(action: str, error: InjectedError) -> str:
+    if action in RDS_ACTIONS | STS_ACTIONS:
+        xmlns = STS_XMLNS if action in STS_ACTIONS else RDS_XMLNS
+        return (
+            f'<ErrorResponse xmlns="{xmlns}">'
+            f"<Error><Type>Sender</Type><Code>{escape(error.code)}</Code>"
+            f"<Message>{escape(error.message)}</Message></Error>"
+            f"<RequestId>{uuid.uuid4()}</RequestId></ErrorResponse>"
+        )
+    return (
+        "<Response><Errors><Error>"
+        f"<Code>{escape(error.code)}</Code><Message>{escape(error.message)}</Message>"
+        f"</Error></Errors><RequestID>{uuid.uuid4()}</RequestID></Response>"
+    )
@@ -3,7 +3,7 @@ from typing import Any
 import pytest
 from external_resources_io.input import parse_model
 
-from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput, RdsProxyData
 
 DEFAULT_DATA: dict = {
     "region": "us-east-1",
@@ -74,9 +74,12 @@ def build_input_data(  # ruff: ignore[too-many-arguments]
         identifier: Override identifier
         output_resource_name: Override output_resource_name
         tags: Override tags
+        alarms: Override alarms
+        client_pools: Override client_pools
         connection_borrow_timeout: Override connection_borrow_timeout
         db_instance_identifier: Override db_instance_identifier
         debug_logging: Override debug_logging
+        debug_logging_expires_at: Override debug_logging_expires_at
         engine_family: Override engine_family
         iam_role_force_detach_policies: Override iam_role_force_detach_policies
         iam_role_max_session_duration: Override iam_role_max_session_duration
@@ -102,7 +105,7 @@ def build_input_data(  # ruff: ignore[too-many-arguments]
         "username": username,
     }
 
-    if unexpected := kwargs.keys() - DEFAULT_DATA.keys():
+    if unexpected := kwargs.keys() - RdsProxyData.model_fields.keys():
         raise TypeError(
             f"build_input_data() got unexpected keyword argument(s): {unexpected}"
         )
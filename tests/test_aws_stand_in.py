@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from external_resources_io.terraform import Action, Change, ResourceChange
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from hooks.post_plan import RdsProxyPlanValidator, TerraformJsonPlanParser
+from hooks_lib.aws_api import AWSApi, DBInstanceRef, SecurityGroupRef, SubnetRef
+from hooks_lib.credential_cache import CACHE_FILE_NAME, FileCredentialCache
+from tests.aws_stand_in import AWSStandIn, InjectedError
+from tests.conftest import build_input_data
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def aws_stand_in(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> Iterator[AWSStandIn]:
+    """A running stand-in server with fake credentials in the environment."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_SESSION_TOKEN", raising=False)
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    monkeypatch.setenv("AWS_CONFIG_FILE", f"{tmp_path}/config")
+    monkeypatch.setenv("AWS_SHARED_CREDENTIALS_FILE", f"{tmp_path}/credentials")
+    with AWSStandIn(
+        subnets={"subnet-1": "vpc-1", "subnet-2": "vpc-1", "subnet-3": "vpc-2"},
+        security_groups={"sg-1": "vpc-1", "sg-2": "vpc-2"},
+        db_instances={"db-1": "postgres"},
+    ) as stand_in:
+        yield stand_in
+
+
+@pytest.fixture
+def aws_api(aws_stand_in: AWSStandIn) -> AWSApi:
+    """AWSApi pointing at the stand-in server."""
+    return AWSApi(
+        config_options={"region_name": "us-east-1", "retries": {"max_attempts": 3}},
+        endpoint_url=aws_stand_in.endpoint_url,
+    )
+
+
+def test_get_subnet_refs(aws_api: AWSApi, aws_stand_in: AWSStandIn) -> None:
+    """Test DescribeSubnets round trip."""
+    assert aws_api.get_subnet_refs(["subnet-1", "subnet-3"]) == [
+        SubnetRef(subnet_id="subnet-1", vpc_id="vpc-1"),
+        SubnetRef(subnet_id="subnet-3", vpc_id="vpc-2"),
+    ]
+    assert aws_stand_in.requests == {"DescribeSubnets": 1}
+
+
+def test_get_security_group_refs(aws_api: AWSApi) -> None:
+    """Test DescribeSecurityGroups round trip."""
+    assert aws_api.get_security_group_refs(["sg-2"]) == [
+        SecurityGroupRef(group_id="sg-2", vpc_id="vpc-2")
+    ]
+
+
+def test_subnet_not_found(aws_api: AWSApi) -> None:
+    """Test unknown subnets are reported like EC2 does."""
+    with pytest.raises(ClientError) as e:
+        aws_api.get_subnets(["subnet-1", "subnet-404"])
+    assert e.value.response["Error"]["Code"] == "InvalidSubnetID.NotFound"
+
+
+def test_get_db_instance_ref(aws_api: AWSApi, aws_stand_in: AWSStandIn) -> None:
+    """Test DescribeDBInstances round trip."""
+    assert aws_api.get_db_instance_ref("db-1") == DBInstanceRef("db-1", "postgres")
+    assert aws_stand_in.requests == {"DescribeDBInstances": 1}
+
+    with pytest.raises(aws_api.rds_client.exceptions.DBInstanceNotFoundFault):
+        aws_api.get_db_instance_ref("db-404")
+
+
+def test_throttling_is_retried(aws_api: AWSApi, aws_stand_in: AWSStandIn) -> None:
+    """Test botocore retries throttled calls."""
+    aws_stand_in.throttle_every = 2
+    client = aws_api.ec2_client
+    client.describe_subnets(SubnetIds=["subnet-1"])
+    client.describe_subnets(SubnetIds=["subnet-1"])
+
+    assert aws_stand_in.throttled == 1
+    assert aws_stand_in.requests == {"DescribeSubnets": 3}
+
+
+def test_injected_error(aws_api: AWSApi, aws_stand_in: AWSStandIn) -> None:
+    """Test error injection per action."""
+    aws_stand_in.errors["DescribeSecurityGroups"] = InjectedError(
+        code="UnauthorizedOperation", status=403
+    )
+    with pytest.raises(ClientError) as e:
+        aws_api.get_security_groups(["sg-1"])
+    assert e.value.response["Error"]["Code"] == "UnauthorizedOperation"
+
+
+def test_connection_reuse(aws_api: AWSApi, aws_stand_in: AWSStandIn) -> None:
+    """Test a single client keeps its connection alive between calls."""
+    client = aws_api.ec2_client
+    for _ in range(3):
+        client.describe_subnets(SubnetIds=["subnet-1"])
+    assert aws_stand_in.connections == 1
+
+
+def test_plan_validator_end_to_end(
+    ai_input: AppInterfaceInput,
+    aws_stand_in: AWSStandIn,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test RdsProxyPlanValidator against the stand-in."""
+    monkeypatch.setenv("AWS_ENDPOINT_URL", aws_stand_in.endpoint_url)
+    parser = MagicMock(spec=TerraformJsonPlanParser)
+    parser.plan = MagicMock()
+    parser.plan.resource_changes = [
+        ResourceChange(
+            type="aws_db_proxy",
+            change=Change(
+                actions=[Action.ActionCreate],
+                after={
+                    "vpc_subnet_ids": ["subnet-1", "subnet-2"],
+                    "vpc_security_group_ids": ["sg-1", "sg-2"],
+                },
+                after_unknown={},
+            ),
+        )
+    ]
+
+    validator = RdsProxyPlanValidator(parser, ai_input)
+
+    assert not validator.validate()
+    assert validator.errors == [
+        "Security group sg-2 does not belong to the same VPC as the subnets"
+    ]
+    assert aws_stand_in.requests == {
+        "DescribeSubnets": 1,
+        "DescribeSecurityGroups": 1,
+    }
+    assert {r.check: r.api_calls for r in validator.results.results} == {
+        "debug_logging": 0,
+        "iam_auth": 0,
+        "idle_client_timeout": 0,
+        "security_groups": 1,
+        "subnets": 1,
+    }
+
+
+@pytest.mark.parametrize(
+    ("db_instance_identifier", "expected"),
+    [
+        ("db-1", []),
+        ("db-2", ["DB_INSTANCE_ENGINE_MISMATCH"]),
+        ("db-404", ["DB_INSTANCE_NOT_FOUND"]),
+    ],
+)
+def test_plan_validator_db_instance_target(
+    ai_input: AppInterfaceInput,
+    aws_stand_in: AWSStandIn,
+    monkeypatch: pytest.MonkeyPatch,
+    db_instance_identifier: str,
+    expected: list[str],
+) -> None:
+    """Test the proxy target validation against the stand-in."""
+    aws_stand_in.db_instances["db-2"] = "mysql"
+    monkeypatch.setenv("AWS_ENDPOINT_URL", aws_stand_in.endpoint_url)
+    parser = MagicMock(spec=TerraformJsonPlanParser)
+    parser.plan = MagicMock()
+    parser.plan.resource_changes = [
+        ResourceChange(
+            type="aws_db_proxy_target",
+            change=Change(
+                actions=[Action.ActionCreate],
+                after={"db_instance_identifier": db_instance_identifier},
+                after_unknown={},
+            ),
+        )
+    ]
+
+    validator = RdsProxyPlanValidator(parser, ai_input)
+
+    assert validator.validate() == (not expected)
+    [result] = [r for r in validator.results.results if r.check == "db_instance"]
+    assert [f.code for f in result.findings] == expected
+    assert aws_stand_in.requests == {"DescribeDBInstances": 1}
+
+
+@pytest.mark.parametrize(
+    ("credentials_ttl", "expected_sts_calls"),
+    [(timedelta(hours=1), 1), (timedelta(minutes=5), 2)],
+)
+def test_credential_cache_shared_between_processes(
+    aws_stand_in: AWSStandIn,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    credentials_ttl: timedelta,
+    expected_sts_calls: int,
+) -> None:
+    """Test assumed role credentials are reused until near expiry."""
+    (tmp_path / "config").write_text(
+        "[default]\n"
+        "role_arn = arn:aws:iam::123456789012:role/er-aws-rds-proxy\n"
+        "source_profile = base\n"
+    )
+    (tmp_path / "credentials").write_text(
+        "[base]\naws_access_key_id = testing\naws_secret_access_key = testing\n"
+    )
+    monkeypatch.delenv("AWS_ACCESS_KEY_ID")
+    monkeypatch.delenv("AWS_SECRET_ACCESS_KEY")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("AWS_ENDPOINT_URL", aws_stand_in.endpoint_url)
+    aws_stand_in.credentials_ttl = credentials_ttl
+
+    caches = []
+    for _ in range(2):
+        # a new cache and session per hook process
+        cache = FileCredentialCache(tmp_path / "work" / CACHE_FILE_NAME)
+        api = AWSApi(
+            config_options={"region_name": "us-east-1"}, credential_cache=cache
+        )
+        api.get_subnet_refs(["subnet-1"])
+        caches.append(cache)
+
+    assert aws_stand_in.requests["AssumeRole"] == expected_sts_calls
+    assert sum(c.sts_calls for c in caches) == expected_sts_calls
+    assert caches[1].hits == 2 - expected_sts_calls
+
+
+@pytest.mark.parametrize(
+    ("security_groups", "expected"),
+    [(["sg-1"], (1, 2)), (["sg-1", "sg-2"], (3, 0))],
+)
+def test_plan_validator_reuses_passed_fingerprints(
+    aws_stand_in: AWSStandIn,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    security_groups: list[str],
+    expected: tuple[int, int],
+) -> None:
+    """Test re-plans of a validated proxy skip AWS, failures are validated again."""
+    ai_input = AppInterfaceInput.model_validate(build_input_data())
+    expected_requests, expected_hits = expected
+    monkeypatch.setenv("AWS_ENDPOINT_URL", aws_stand_in.endpoint_url)
+    monkeypatch.setenv("WORK", str(tmp_path / "work"))
+    parser = MagicMock(spec=TerraformJsonPlanParser)
+    parser.plan = MagicMock()
+    parser.plan.resource_changes = [
+        ResourceChange(
+            type="aws_db_proxy",
+            change=Change(
+                actions=[Action.ActionCreate],
+                after={
+                    "vpc_subnet_ids": ["subnet-2", "subnet-1"],
+                    "vpc_security_group_ids": security_groups,
+                },
+                after_unknown={},
+            ),
+        )
+    ]
+
+    hits = 0
+    for _ in range(3):
+        # a new validator per hook run
+        validator = RdsProxyPlanValidator(parser, ai_input)
+        validator.validate()
+        assert validator.fingerprints is not None
+        hits += validator.fingerprints.hits
+
+    assert aws_stand_in.requests["DescribeSubnets"] == expected_requests
+    assert hits == expected_hits
+    assert all(
+        r.cached == bool(expected_hits)
+        for r in validator.results.results
+        if r.check == "subnets"
+    )
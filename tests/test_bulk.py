@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from er_aws_rds_proxy.bulk import bulk_generate, link_tree, main, prepare_template
+from tests.conftest import DEFAULT_PROVISION, build_input_data
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from unittest.mock import MagicMock
+
+
+@pytest.fixture
+def module_dir(tmp_path: Path) -> Path:
+    """A module directory with an initialized .terraform data dir."""
+    module = tmp_path / "module"
+    (module / ".terraform" / "providers").mkdir(parents=True)
+    (module / ".terraform" / "providers" / "terraform-provider-aws").write_bytes(
+        b"binary"
+    )
+    (module / ".terraform" / "modules").symlink_to("providers")
+    (module / ".terraform" / "terraform.tfstate").write_text("{}")
+    (module / "main.tf").write_text("# main\n")
+    (module / "terraform.tfvars.json").write_text("{}")
+    return module
+
+
+def write_input(tmp_path: Path, identifier: str, region: str, bucket: str) -> Path:
+    data = build_input_data(identifier=identifier, region=region)
+    data["provision"] = DEFAULT_PROVISION | {
+        "identifier": identifier,
+        "module_provision_data": DEFAULT_PROVISION["module_provision_data"]
+        | {"tf_state_bucket": bucket},
+    }
+    path = tmp_path / f"{identifier}.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_link_tree(module_dir: Path, tmp_path: Path) -> None:
+    """Test provider binaries are hardlinked and the rest copied."""
+    work_dir = tmp_path / "work"
+    link_tree(module_dir, work_dir)
+
+    provider = ".terraform/providers/terraform-provider-aws"
+    assert (work_dir / provider).stat().st_ino == (module_dir / provider).stat().st_ino
+    assert (work_dir / "main.tf").stat().st_ino != (
+        module_dir / "main.tf"
+    ).stat().st_ino
+    assert (work_dir / ".terraform" / "modules").is_symlink()
+    state = ".terraform/terraform.tfstate"
+    assert (work_dir / state).stat().st_ino != (module_dir / state).stat().st_ino
+
+
+def test_link_tree_rerun(module_dir: Path, tmp_path: Path) -> None:
+    """Test a rerun refreshes the work dir without touching the template."""
+    work_dir = tmp_path / "work"
+    link_tree(module_dir, work_dir)
+    (work_dir / ".terraform" / "terraform.tfstate").write_text('{"backend": {}}')
+    (module_dir / "main.tf").write_text("# main v2\n")
+
+    link_tree(module_dir, work_dir)
+
+    assert (work_dir / "main.tf").read_text() == "# main v2\n"
+    assert (module_dir / ".terraform" / "terraform.tfstate").read_text() == "{}"
+    assert (work_dir / ".terraform" / "modules").is_symlink()
+
+
+def test_prepare_template_skips_generated_files(
+    module_dir: Path, tmp_path: Path
+) -> None:
+    """Test generated files of a previous run are not part of the template."""
+    template = tmp_path / "template"
+    prepare_template(module_dir, template, init=False)
+
+    assert (template / "main.tf").exists()
+    assert not (template / "terraform.tfvars.json").exists()
+
+
+def test_prepare_template_init(
+    module_dir: Path, tmp_path: Path, mocker: MagicMock
+) -> None:
+    """Test the template is initialized once without backend."""
+    run = mocker.patch("er_aws_rds_proxy.bulk.subprocess.run")
+    template = tmp_path / "template"
+    prepare_template(module_dir, template, init=True)
+
+    run.assert_called_once_with(
+        ["terraform", f"-chdir={template}", "init", "-backend=false", "-input=false"],
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_bulk_generate(module_dir: Path, tmp_path: Path) -> None:
+    """Test inputs are grouped and rendered into per identifier trees."""
+    input_files = [
+        write_input(tmp_path, "proxy-1", "us-east-1", "bucket-a"),
+        write_input(tmp_path, "proxy-2", "eu-west-1", "bucket-a"),
+        write_input(tmp_path, "proxy-3", "us-east-1", "bucket-a"),
+    ]
+    output_dir = tmp_path / "out"
+
+    report = bulk_generate(input_files, output_dir, module_dir, max_workers=2)
+
+    assert [(g.region, g.identifiers) for g in report.groups] == [
+        ("eu-west-1", ["proxy-2"]),
+        ("us-east-1", ["proxy-1", "proxy-3"]),
+    ]
+    assert set(report.stages) == {"load", "template", "build", "link", "render"}
+    work_dir = output_dir / "us-east-1" / "bucket-a" / "proxy-3"
+    tf_vars = json.loads((work_dir / "terraform.tfvars.json").read_text())
+    assert tf_vars["identifier"] == "proxy-3"
+    assert 'bucket       = "bucket-a"' in (work_dir / "backend.tf").read_text()
+    assert (work_dir / ".terraform" / "providers" / "terraform-provider-aws").exists()
+
+
+def test_main(module_dir: Path, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Test the generate-tf-config-bulk entry point."""
+    input_file = write_input(tmp_path, "proxy-1", "us-east-1", "bucket-a")
+    main([
+        str(input_file),
+        f"--output-dir={tmp_path / 'out'}",
+        f"--module-dir={module_dir}",
+    ])
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["groups"][0]["identifiers"] == ["proxy-1"]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from external_resources_io.config import EnvVar
+from external_resources_io.input import parse_model
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.capacity import (
+    BORROW_TIMEOUT_RISK,
+    DEFAULT_CONNECTION_BORROW_TIMEOUT,
+    Workload,
+    capacity_report,
+    erlang_c,
+    main,
+)
+from tests.conftest import build_input_data
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_erlang_c() -> None:
+    """Test Erlang C against known values."""
+    assert erlang_c(1, 0.5) == pytest.approx(0.5)
+    assert erlang_c(2, 1.0) == pytest.approx(1 / 3)
+    assert erlang_c(10, 10) == pytest.approx(1)
+
+
+def test_capacity_report_healthy(ai_input: AppInterfaceInput) -> None:
+    """Test a workload comfortably served by the pool."""
+    workload = Workload(
+        client_connections=200,
+        queries_per_second=500,
+        mean_transaction_time=0.01,
+        db_max_connections=100,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.pool_size == pytest.approx(90)
+    assert report.busy_connections == pytest.approx(5)
+    assert report.headroom == pytest.approx(85)
+    assert report.borrow_timeout == DEFAULT_CONNECTION_BORROW_TIMEOUT
+    assert report.borrow_timeout_probability == pytest.approx(0, abs=1e-9)
+    assert report.warnings == []
+
+
+def test_capacity_report_large_lightly_loaded_pool(
+    ai_input: AppInterfaceInput,
+) -> None:
+    """Test borrows never wait when the Erlang C probability underflows."""
+    assert erlang_c(1000, 5) == 0
+    workload = Workload(
+        client_connections=200,
+        queries_per_second=500,
+        mean_transaction_time=0.01,
+        db_max_connections=2000,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.wait_probability == 0
+    assert report.borrow_wait == {50: 0, 95: 0, 99: 0}
+    assert report.borrow_timeout_probability == 0
+    assert report.warnings == []
+
+
+def test_capacity_report_saturated(ai_input: AppInterfaceInput) -> None:
+    """Test pinned sessions exhausting the pool."""
+    workload = Workload(
+        client_connections=500,
+        queries_per_second=500,
+        mean_transaction_time=0.01,
+        pinning_ratio=0.5,
+        db_max_connections=100,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.pinned_connections == pytest.approx(250)
+    assert report.borrow_wait == {50: None, 95: None, 99: None}
+    assert report.borrow_timeout_probability == pytest.approx(1)
+    assert any("Pool saturated" in w for w in report.warnings)
+    assert any("connection_borrow_timeout" in w for w in report.warnings)
+
+
+def test_capacity_report_borrow_timeout_risk() -> None:
+    """Test a near-saturated pool with a short borrow timeout."""
+    ai_input = parse_model(
+        AppInterfaceInput,
+        build_input_data(connection_borrow_timeout=1, max_connections_percent=50),
+    )
+    workload = Workload(
+        client_connections=100,
+        queries_per_second=99,
+        mean_transaction_time=0.5,
+        db_max_connections=100,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.pool_size == pytest.approx(50)
+    assert report.borrow_wait[99] is not None
+    assert report.borrow_wait[99] > 1
+    assert report.borrow_timeout_probability > BORROW_TIMEOUT_RISK
+    assert any("connection_borrow_timeout (1s)" in w for w in report.warnings)
+    assert any("headroom" in w for w in report.warnings)
+
+
+def test_capacity_report_zero_borrow_timeout() -> None:
+    """Test connection_borrow_timeout=0 times out every borrow that waits."""
+    ai_input = parse_model(
+        AppInterfaceInput,
+        build_input_data(connection_borrow_timeout=0, max_connections_percent=50),
+    )
+    workload = Workload(
+        client_connections=100,
+        queries_per_second=80,
+        mean_transaction_time=0.5,
+        db_max_connections=100,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.borrow_timeout == 0
+    assert report.wait_probability > BORROW_TIMEOUT_RISK
+    assert report.borrow_timeout_probability == pytest.approx(report.wait_probability)
+    assert any("connection_borrow_timeout (0s)" in w for w in report.warnings)
+
+
+def test_capacity_report_idle_client_timeout() -> None:
+    """Test clients idling longer than idle_client_timeout between requests."""
+    ai_input = parse_model(AppInterfaceInput, build_input_data(idle_client_timeout=60))
+    workload = Workload(
+        client_connections=1000,
+        queries_per_second=5,
+        mean_transaction_time=0.01,
+        db_max_connections=100,
+    )
+    report = capacity_report(ai_input.data, workload)
+
+    assert report.warnings == [
+        (
+            "Clients send a request every 200s on average, idle_client_timeout (60s) "
+            "will disconnect them between requests"
+        )
+    ]
+
+
+def test_main(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Test the capacity-report entry point."""
+    input_json = tmp_path / "input.json"
+    input_json.write_text(json.dumps(build_input_data()))
+    monkeypatch.setenv(EnvVar.INPUT_FILE, str(input_json))
+    args = [
+        "--client-connections=200",
+        "--qps=500",
+        "--mean-transaction-ms=10",
+        "--db-max-connections=100",
+    ]
+
+    main([*args, "--json"])
+    assert json.loads(capsys.readouterr().out)["pool_size"] == pytest.approx(90)
+
+    main(args)
+    assert (
+        "Capacity report for app-int-example-01-rds-proxy1" in capsys.readouterr().out
+    )
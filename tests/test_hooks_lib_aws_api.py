@@ -7,7 +7,7 @@ import pytest
 if TYPE_CHECKING:
     from unittest.mock import MagicMock
 
-from hooks_lib.aws_api import AWSApi
+from hooks_lib.aws_api import AWSApi, SecurityGroupRef, SubnetRef
 
 
 @pytest.fixture
@@ -34,6 +34,18 @@ def test_aws_api_init(mock_session: MagicMock, mock_botocore_config: MagicMock)
     assert api.session == mock_session_instance
     mock_botocore_config.assert_called_once_with(**config_options)
     assert api.config == mock_config_instance
+    assert api.endpoint_url is None
+
+
+def test_aws_api_init_credential_cache(
+    mock_session: MagicMock, mocker: MagicMock
+) -> None:
+    """Test AWSApi uses the botocore session of a credential cache."""
+    cache = mocker.MagicMock()
+
+    AWSApi(config_options={}, credential_cache=cache)
+
+    mock_session.assert_called_once_with(botocore_session=cache.session.return_value)
 
 
 @pytest.fixture
@@ -52,10 +64,13 @@ def aws_api(
 
 
 def test_aws_api_ec2_client(aws_api: tuple[AWSApi, MagicMock]) -> None:
-    """Test AWSApi.ec2_client property."""
+    """Test AWSApi.ec2_client is created once."""
     api, mock_session = aws_api
     client = api.ec2_client
-    mock_session.client.assert_called_once_with("ec2", config=api.config)
+    assert api.ec2_client is client
+    mock_session.client.assert_called_once_with(
+        "ec2", config=api.config, endpoint_url=None
+    )
     assert client == mock_session.client.return_value
 
 
@@ -101,3 +116,49 @@ def test_get_security_groups(
     mock_client.describe_security_groups.assert_called_once_with(GroupIds=sg_ids)
 
     assert sgs == expected_sgs
+
+
+def test_get_subnet_refs(aws_api_with_mock_client: tuple[AWSApi, MagicMock]) -> None:
+    """Test AWSApi.get_subnet_refs."""
+    api, mock_client = aws_api_with_mock_client
+    vpc = 1
+    # distinct but equal string objects
+    mock_client.describe_subnets.return_value = {
+        "Subnets": [
+            {"SubnetId": "subnet-1", "VpcId": f"vpc-{vpc}", "Tags": []},
+            {"SubnetId": "subnet-2", "VpcId": f"vpc-{vpc}"},
+            {"SubnetId": "subnet-3"},
+        ]
+    }
+
+    refs = api.get_subnet_refs(subnets=["subnet-1", "subnet-2", "subnet-3"])
+
+    assert refs == [
+        SubnetRef(subnet_id="subnet-1", vpc_id="vpc-1"),
+        SubnetRef(subnet_id="subnet-2", vpc_id="vpc-1"),
+        SubnetRef(subnet_id="subnet-3", vpc_id=None),
+    ]
+    assert refs[0].vpc_id is refs[1].vpc_id
+
+
+def test_get_security_group_refs(
+    aws_api_with_mock_client: tuple[AWSApi, MagicMock],
+) -> None:
+    """Test AWSApi.get_security_group_refs."""
+    api, mock_client = aws_api_with_mock_client
+    vpc = 1
+    # distinct but equal string objects
+    mock_client.describe_security_groups.return_value = {
+        "SecurityGroups": [
+            {"GroupId": "sg-1", "VpcId": f"vpc-{vpc}", "IpPermissions": []},
+            {"GroupId": "sg-2", "VpcId": f"vpc-{vpc}"},
+        ]
+    }
+
+    refs = api.get_security_group_refs(security_groups=["sg-1", "sg-2"])
+
+    assert refs == [
+        SecurityGroupRef(group_id="sg-1", vpc_id="vpc-1"),
+        SecurityGroupRef(group_id="sg-2", vpc_id="vpc-1"),
+    ]
+    assert refs[0].vpc_id is refs[1].vpc_id
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import stat
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hooks_lib.credential_cache import CACHE_FILE_NAME, FileCredentialCache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+
+def credentials(expires_in: timedelta) -> dict[str, Any]:
+    """An AssumeRole response as cached by botocore"""
+    return {
+        "Credentials": {
+            "AccessKeyId": "ASIAEXAMPLE",
+            "SecretAccessKey": "secret",
+            "SessionToken": "token",
+            "Expiration": datetime.now(UTC) + expires_in,
+        }
+    }
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> FileCredentialCache:
+    """A cache in an empty work dir."""
+    return FileCredentialCache(tmp_path / CACHE_FILE_NAME)
+
+
+def test_miss_on_empty_cache(cache: FileCredentialCache) -> None:
+    """Test lookups in an empty cache are misses."""
+    assert "key" not in cache
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.hit_rate == pytest.approx(0)
+
+
+def test_hit_shared_between_instances(cache: FileCredentialCache) -> None:
+    """Test credentials written by one instance are read by another."""
+    cache["key"] = credentials(timedelta(hours=1))
+    other = FileCredentialCache(cache.path)
+    assert "key" in other
+    assert other["key"]["Credentials"]["AccessKeyId"] == "ASIAEXAMPLE"
+    assert (other.hits, other.misses) == (1, 0)
+    assert other.hit_rate == pytest.approx(1)
+
+
+def test_near_expiry_is_a_miss(cache: FileCredentialCache) -> None:
+    """Test credentials within the refresh margin are fetched again."""
+    cache["key"] = credentials(cache.refresh_margin - timedelta(minutes=1))
+    assert "key" not in cache
+    assert cache.misses == 1
+
+
+def test_expired_entries_dropped_on_write(cache: FileCredentialCache) -> None:
+    """Test writes drop entries close to expiry."""
+    cache["old"] = credentials(timedelta(minutes=1))
+    cache["new"] = credentials(timedelta(hours=1))
+    assert list(cache.file.read()) == ["new"]
+
+
+def test_file_private(cache: FileCredentialCache) -> None:
+    """Test the cache file is only readable by its owner."""
+    cache["key"] = credentials(timedelta(hours=1))
+    assert stat.S_IMODE(cache.path.stat().st_mode) == stat.S_IRUSR | stat.S_IWUSR
+
+
+def test_corrupt_file_ignored(cache: FileCredentialCache) -> None:
+    """Test a corrupt cache file is treated as empty and replaced."""
+    cache.path.write_text("{")
+    assert "key" not in cache
+    cache["key"] = credentials(timedelta(hours=1))
+    assert "key" in cache
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test the cache lives in $WORK and is disabled without it."""
+    monkeypatch.delenv("WORK", raising=False)
+    assert FileCredentialCache.from_env() is None
+    monkeypatch.setenv("WORK", str(tmp_path))
+    cache = FileCredentialCache.from_env()
+    assert cache is not None
+    assert cache.path == tmp_path / CACHE_FILE_NAME
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from hooks_lib.fingerprints import STORE_FILE_NAME, FingerprintStore, fingerprint
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def test_fingerprint_ignores_order() -> None:
+    """Test subnet and security group order does not matter."""
+    assert fingerprint("acc", "us-east-1", ["s-1", "s-2"], ["sg-1"]) == fingerprint(
+        "acc", "us-east-1", ["s-2", "s-1"], ["sg-1"]
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("other", "us-east-1", ["s-1"], ["sg-1"]),
+        ("acc", "us-west-2", ["s-1"], ["sg-1"]),
+        ("acc", "us-east-1", ["s-2"], ["sg-1"]),
+        ("acc", "us-east-1", ["s-1"], ["sg-2"]),
+        ("acc", "us-east-1", [], ["s-1", "sg-1"]),
+    ],
+)
+def test_fingerprint_changes(args: tuple[str, str, list[str], list[str]]) -> None:
+    """Test every input is part of the fingerprint."""
+    assert fingerprint(*args) != fingerprint("acc", "us-east-1", ["s-1"], ["sg-1"])
+
+
+def test_store_hit_after_pass(tmp_path: Path) -> None:
+    """Test a recorded pass is shared with other store instances."""
+    FingerprintStore(tmp_path / STORE_FILE_NAME).record_pass("key")
+    store = FingerprintStore(tmp_path / STORE_FILE_NAME)
+    assert store.passed("key")
+    assert not store.passed("other")
+    assert (store.hits, store.misses) == (1, 1)
+    assert store.hit_ratio == pytest.approx(0.5)
+
+
+def test_store_ttl(tmp_path: Path, mocker: MockerFixture) -> None:
+    """Test passes expire after the TTL and are dropped on the next write."""
+    store = FingerprintStore(tmp_path / STORE_FILE_NAME, ttl=timedelta(minutes=5))
+    time = mocker.patch("hooks_lib.fingerprints.time.time", return_value=1000.0)
+    store.record_pass("old")
+    time.return_value += 301
+    assert not store.passed("old")
+    store.record_pass("new")
+    assert list(store.file.read()) == ["new"]
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test the store lives in $WORK and is disabled without it."""
+    monkeypatch.delenv("WORK", raising=False)
+    assert FingerprintStore.from_env() is None
+    monkeypatch.setenv("WORK", str(tmp_path))
+    store = FingerprintStore.from_env()
+    assert store is not None
+    assert store.file.path == tmp_path / STORE_FILE_NAME
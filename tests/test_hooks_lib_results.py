@@ -0,0 +1,100 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from hooks_lib.results import (
+    CheckResult,
+    Finding,
+    ResultCollector,
+    Severity,
+    count_api_call,
+)
+
+
+def test_check_records_findings_and_api_calls() -> None:
+    """Test a check records its findings, duration and API calls."""
+    collector = ResultCollector()
+    with collector.check("proxy-1", "subnets", "aws_db_proxy.this") as recorder:
+        count_api_call()
+        count_api_call()
+        recorder.error("SUBNET_NOT_FOUND", "Subnet(s) {'subnet-1'} not found")
+        recorder.warning("SLOW", "slow")
+    count_api_call()
+
+    [result] = collector.results
+    assert result.model_dump(exclude={"duration"}) == {
+        "proxy": "proxy-1",
+        "check": "subnets",
+        "resource": "aws_db_proxy.this",
+        "api_calls": 2,
+        "cached": False,
+        "findings": [
+            {
+                "code": "SUBNET_NOT_FOUND",
+                "severity": Severity.ERROR,
+                "message": "Subnet(s) {'subnet-1'} not found",
+            },
+            {"code": "SLOW", "severity": Severity.WARNING, "message": "slow"},
+        ],
+    }
+    assert result.duration >= 0
+    assert not result.passed
+    assert collector.messages(Severity.WARNING) == ["slow"]
+
+
+def test_concurrent_checks_are_deterministic() -> None:
+    """Test concurrent checks keep their own API call counts and a stable order."""
+    collector = ResultCollector()
+
+    def run(i: int) -> None:
+        with collector.check(f"proxy-{i % 10:02}", f"check-{i // 10:02}") as recorder:
+            for _ in range(i):
+                count_api_call()
+            recorder.error("E", f"error {i}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(run, reversed(range(100))))
+
+    results = collector.results
+    assert [(r.proxy, r.check) for r in results] == sorted(
+        (f"proxy-{i % 10:02}", f"check-{i // 10:02}") for i in range(100)
+    )
+    assert all(r.api_calls == int(r.findings[0].message.split()[1]) for r in results)
+
+
+def test_to_json_and_text() -> None:
+    """Test JSON and human readable output."""
+    collector = ResultCollector()
+    collector.add(
+        CheckResult(
+            proxy="proxy-1",
+            check="security_groups",
+            resource="aws_db_proxy.this",
+            duration=0.0125,
+            api_calls=1,
+            findings=[
+                Finding(
+                    code="SECURITY_GROUP_VPC_MISMATCH",
+                    severity=Severity.ERROR,
+                    message="Security group sg-2 does not belong to the same VPC as the subnets",
+                )
+            ],
+        )
+    )
+    collector.add(
+        CheckResult(proxy="proxy-1", check="debug_logging", duration=0, api_calls=0)
+    )
+
+    assert json.loads(collector.to_json())["results"][1]["findings"][0]["code"] == (
+        "SECURITY_GROUP_VPC_MISMATCH"
+    )
+    assert collector.to_text() == (
+        "proxy-1 debug_logging: passed (0.0ms, 0 API call(s))\n"
+        "proxy-1 aws_db_proxy.this security_groups: FAILED (12.5ms, 1 API call(s))\n"
+        "  ERROR SECURITY_GROUP_VPC_MISMATCH: Security group sg-2 does not belong "
+        "to the same VPC as the subnets\n"
+    )
+
+
+def test_to_text_empty() -> None:
+    """Test no output without results."""
+    assert not ResultCollector().to_text()
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, patch
 
 import pytest
 from botocore.exceptions import ClientError
+from external_resources_io.input import parse_model
 from external_resources_io.terraform import Action, ResourceChange
 
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
 from hooks.post_plan import RdsProxyPlanValidator, TerraformJsonPlanParser
+from hooks_lib.aws_api import DBInstanceRef, SecurityGroupRef, SubnetRef
+from tests.conftest import build_input_data
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
-    from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
-
 
 @pytest.fixture
 def mock_terraform_plan_parser() -> MagicMock:
@@ -44,17 +47,18 @@ def test_rds_proxy_plan_validator_validate_success(
         "subnet-0a1b2c3d4e5f6a7c0",
     ]
     security_groups = ["sg-0a1b2c3d4e5f6a7b8"]
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": s, "VpcId": "vpc-123"} for s in subnets
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(s, "vpc-123") for s in subnets
     ]
-    mock_aws_api.return_value.get_security_groups.return_value = [
-        {"GroupId": sg, "VpcId": "vpc-123"} for sg in security_groups
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef(sg, "vpc-123") for sg in security_groups
     ]
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -83,17 +87,18 @@ def test_rds_proxy_plan_validator_validate_failure_missing_subnet(
     ]
     security_groups = ["sg-0a1b2c3d4e5f6a7b8"]
     # Only return 2 of the 3 subnets
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": s, "VpcId": "vpc-123"} for s in subnets[:2]
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(s, "vpc-123") for s in subnets[:2]
     ]
-    mock_aws_api.return_value.get_security_groups.return_value = [
-        {"GroupId": sg, "VpcId": "vpc-123"} for sg in security_groups
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef(sg, "vpc-123") for sg in security_groups
     ]
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -124,19 +129,20 @@ def test_rds_proxy_plan_validator_validate_failure_subnets_different_vpcs(
     ]
     security_groups = ["sg-0a1b2c3d4e5f6a7b8"]
     # Return subnets in different VPCs
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": subnets[0], "VpcId": "vpc-123"},
-        {"SubnetId": subnets[1], "VpcId": "vpc-456"},
-        {"SubnetId": subnets[2], "VpcId": "vpc-789"},
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(subnets[0], "vpc-123"),
+        SubnetRef(subnets[1], "vpc-456"),
+        SubnetRef(subnets[2], "vpc-789"),
     ]
-    mock_aws_api.return_value.get_security_groups.return_value = [
-        {"GroupId": sg, "VpcId": "vpc-123"} for sg in security_groups
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef(sg, "vpc-123") for sg in security_groups
     ]
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -167,18 +173,19 @@ def test_rds_proxy_plan_validator_validate_failure_missing_security_group(
         "subnet-0a1b2c3d4e5f6a7c0",
     ]
     security_groups = ["sg-0a1b2c3d4e5f6a7b8", "sg-0a1b2c3d4e5f6a7b9"]
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": s, "VpcId": "vpc-123"} for s in subnets
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(s, "vpc-123") for s in subnets
     ]
     # Only return 1 of the 2 security groups
-    mock_aws_api.return_value.get_security_groups.return_value = [
-        {"GroupId": security_groups[0], "VpcId": "vpc-123"}
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef(security_groups[0], "vpc-123")
     ]
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -208,17 +215,18 @@ def test_rds_proxy_plan_validator_validate_failure_security_group_wrong_vpc(
         "subnet-0a1b2c3d4e5f6a7c0",
     ]
     security_groups = ["sg-0a1b2c3d4e5f6a7b8"]
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": s, "VpcId": "vpc-123"} for s in subnets
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(s, "vpc-123") for s in subnets
     ]
-    mock_aws_api.return_value.get_security_groups.return_value = [
-        {"GroupId": sg, "VpcId": "vpc-456"} for sg in security_groups
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef(sg, "vpc-456") for sg in security_groups
     ]  # Wrong VPC
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -251,25 +259,30 @@ def test_rds_proxy_plan_validator_no_changes(
     assert not validator.errors
 
 
-def test_rds_proxy_plan_validator_non_create_action(
+def test_rds_proxy_plan_validator_update_without_networking_changes(
     ai_input: AppInterfaceInput,
     mock_terraform_plan_parser: MagicMock,
-    mock_aws_api: MagicMock,  # ruff: ignore[unused-function-argument]
+    mock_aws_api: MagicMock,
 ) -> None:
-    """Test validation with non-create actions (update/delete)."""
-    subnets = ["subnet-1", "subnet-2"]
-    security_groups = ["sg-1"]
+    """Test updates that keep subnets and security groups are skipped."""
+    networking = {
+        "vpc_subnet_ids": ["subnet-1", "subnet-2"],
+        "vpc_security_group_ids": ["sg-1"],
+    }
 
     mock_terraform_plan_parser.plan.resource_changes = [
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
+                before=networking | {"debug_logging": False},
                 after={
-                    "vpc_subnet_ids": subnets,
-                    "vpc_security_group_ids": security_groups,
+                    "vpc_subnet_ids": ["subnet-2", "subnet-1"],
+                    "vpc_security_group_ids": ["sg-1"],
+                    "debug_logging": True,
                 },
-                actions=[Action.ActionUpdate],  # Not a create action
+                actions=[Action.ActionUpdate],
             ),
         )
     ]
@@ -277,6 +290,59 @@ def test_rds_proxy_plan_validator_non_create_action(
     validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
     assert validator.validate()
     assert not validator.errors
+    assert validator.skipped == 1
+    mock_aws_api.return_value.get_subnet_refs.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "actions",
+    [
+        [Action.ActionUpdate],
+        [Action.ActionDelete, Action.ActionCreate],
+        [Action.ActionCreate, Action.ActionDelete],
+    ],
+)
+def test_rds_proxy_plan_validator_networking_change_is_validated(
+    ai_input: AppInterfaceInput,
+    mock_terraform_plan_parser: MagicMock,
+    mock_aws_api: MagicMock,
+    actions: list[Action],
+) -> None:
+    """Test updates and replaces changing the networking are validated."""
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef("subnet-1", "vpc-123"),
+        SubnetRef("subnet-3", "vpc-123"),
+    ]
+    mock_aws_api.return_value.get_security_group_refs.return_value = [
+        SecurityGroupRef("sg-1", "vpc-123")
+    ]
+
+    mock_terraform_plan_parser.plan.resource_changes = [
+        MagicMock(
+            spec=ResourceChange,
+            type="aws_db_proxy",
+            address="aws_db_proxy.this",
+            change=MagicMock(
+                before={
+                    "vpc_subnet_ids": ["subnet-1", "subnet-2"],
+                    "vpc_security_group_ids": ["sg-1"],
+                },
+                after={
+                    "vpc_subnet_ids": ["subnet-1", "subnet-3"],
+                    "vpc_security_group_ids": ["sg-1"],
+                },
+                actions=actions,
+            ),
+        )
+    ]
+
+    validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
+    assert validator.validate()
+    assert validator.skipped == 0
+    mock_aws_api.return_value.get_subnet_refs.assert_called_once_with([
+        "subnet-1",
+        "subnet-3",
+    ])
 
 
 def test_rds_proxy_plan_validator_rds_proxy_instance_updates(
@@ -289,6 +355,7 @@ def test_rds_proxy_plan_validator_rds_proxy_instance_updates(
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={"vpc_subnet_ids": [], "vpc_security_group_ids": []},
                 actions=[Action.ActionCreate],
@@ -297,14 +364,27 @@ def test_rds_proxy_plan_validator_rds_proxy_instance_updates(
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
+                before={"vpc_subnet_ids": [], "vpc_security_group_ids": []},
                 after={"vpc_subnet_ids": [], "vpc_security_group_ids": []},
                 actions=[Action.ActionUpdate],
             ),
         ),
+        MagicMock(
+            spec=ResourceChange,
+            type="aws_db_proxy",
+            address="aws_db_proxy.this",
+            change=MagicMock(
+                before={"vpc_subnet_ids": ["subnet-1"], "vpc_security_group_ids": []},
+                after=None,
+                actions=[Action.ActionDelete],
+            ),
+        ),
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy_default_target_group",
+            address="aws_db_proxy_default_target_group.this",
             change=MagicMock(
                 after={},
                 actions=[Action.ActionCreate],
@@ -315,11 +395,15 @@ def test_rds_proxy_plan_validator_rds_proxy_instance_updates(
     validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
     updates = validator.rds_proxy_instance_updates
 
-    # Should only include aws_db_proxy resources with ActionCreate
+    # Should only include aws_db_proxy resources with networking changes
     assert len(updates) == 1
     assert updates[0].type == "aws_db_proxy"
     assert updates[0].change is not None
     assert Action.ActionCreate in updates[0].change.actions
+    assert (
+        validator.rds_proxy_changes
+        == mock_terraform_plan_parser.plan.resource_changes[:2]
+    )
 
 
 def test_rds_proxy_plan_validator_validate_failure_malformed_subnet_id(
@@ -332,7 +416,7 @@ def test_rds_proxy_plan_validator_validate_failure_malformed_subnet_id(
     security_groups = ["sg-0a1b2c3d4e5f6a7b8"]
 
     # Simulate ClientError for malformed subnet ID
-    mock_aws_api.return_value.get_subnets.side_effect = ClientError(
+    mock_aws_api.return_value.get_subnet_refs.side_effect = ClientError(
         error_response={
             "Error": {
                 "Code": "InvalidSubnetID.Malformed",
@@ -346,6 +430,7 @@ def test_rds_proxy_plan_validator_validate_failure_malformed_subnet_id(
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -375,12 +460,12 @@ def test_rds_proxy_plan_validator_validate_failure_malformed_security_group_id(
     ]
     security_groups = ["sg-1a25f23d9ca77bb24"]  # Malformed ID
 
-    mock_aws_api.return_value.get_subnets.return_value = [
-        {"SubnetId": s, "VpcId": "vpc-123"} for s in subnets
+    mock_aws_api.return_value.get_subnet_refs.return_value = [
+        SubnetRef(s, "vpc-123") for s in subnets
     ]
 
     # Simulate ClientError for malformed security group ID
-    mock_aws_api.return_value.get_security_groups.side_effect = ClientError(
+    mock_aws_api.return_value.get_security_group_refs.side_effect = ClientError(
         error_response={
             "Error": {
                 "Code": "InvalidGroupId.Malformed",
@@ -394,6 +479,7 @@ def test_rds_proxy_plan_validator_validate_failure_malformed_security_group_id(
         MagicMock(
             spec=ResourceChange,
             type="aws_db_proxy",
+            address="aws_db_proxy.this",
             change=MagicMock(
                 after={
                     "vpc_subnet_ids": subnets,
@@ -408,3 +494,151 @@ def test_rds_proxy_plan_validator_validate_failure_malformed_security_group_id(
     assert not validator.validate()
     assert len(validator.errors) == 1
     assert "Error validating security groups" in validator.errors[0]
+
+
+def test_rds_proxy_plan_validator_idle_timeout_warnings(
+    mock_terraform_plan_parser: MagicMock,
+    mock_aws_api: MagicMock,  # ruff: ignore[unused-function-argument]
+) -> None:
+    """Test idle_client_timeout analysis findings are reported as warnings."""
+    ai_input = parse_model(
+        AppInterfaceInput,
+        build_input_data(
+            client_pools=[{"name": "lambda", "max_pool_size": 1, "ephemeral": True}]
+        ),
+    )
+
+    validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
+    assert validator.validate()
+    assert not validator.errors
+    assert len(validator.warnings) == 1
+    assert "keeps abandoned connections open" in validator.warnings[0]
+
+
+@pytest.mark.parametrize(
+    ("environment", "expires_in", "expected"),
+    [
+        ("production", None, (1, 0)),
+        ("production", timedelta(hours=1), (0, 1)),
+        ("stage", None, (0, 0)),
+    ],
+)
+def test_rds_proxy_plan_validator_debug_logging(
+    mock_terraform_plan_parser: MagicMock,
+    mock_aws_api: MagicMock,  # ruff: ignore[unused-function-argument]
+    environment: str,
+    expires_in: timedelta | None,
+    expected: tuple[int, int],
+) -> None:
+    """Test debug_logging guardrails on production proxies.
+
+    expected is the number of (errors, warnings).
+    """
+    ai_input = parse_model(
+        AppInterfaceInput,
+        build_input_data(
+            debug_logging=True,
+            debug_logging_expires_at=expires_in and datetime.now(UTC) + expires_in,
+            tags={"environment": environment},
+        ),
+    )
+
+    validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
+    assert validator.validate() == (not expected[0])
+    assert (len(validator.errors), len(validator.warnings)) == expected
+
+
+@pytest.mark.parametrize(
+    ("lookup", "expected"),
+    [
+        (DBInstanceRef("rds-db-instance-id", "postgres"), []),
+        (DBInstanceRef("rds-db-instance-id", "aurora-postgresql"), []),
+        (
+            DBInstanceRef("rds-db-instance-id", "mysql"),
+            ["DB_INSTANCE_ENGINE_MISMATCH"],
+        ),
+        (
+            ClientError(
+                {"Error": {"Code": "DBInstanceNotFound"}}, "DescribeDBInstances"
+            ),
+            ["DB_INSTANCE_NOT_FOUND"],
+        ),
+        (
+            ClientError({"Error": {"Code": "AccessDenied"}}, "DescribeDBInstances"),
+            ["DB_INSTANCE_LOOKUP_FAILED"],
+        ),
+    ],
+)
+def test_rds_proxy_plan_validator_db_instance(
+    ai_input: AppInterfaceInput,
+    mock_terraform_plan_parser: MagicMock,
+    mock_aws_api: MagicMock,
+    lookup: DBInstanceRef | ClientError,
+    expected: list[str],
+) -> None:
+    """Test the proxy target exists and matches the engine family."""
+    if isinstance(lookup, ClientError):
+        mock_aws_api.return_value.get_db_instance_ref.side_effect = lookup
+    else:
+        mock_aws_api.return_value.get_db_instance_ref.return_value = lookup
+    mock_terraform_plan_parser.plan.resource_changes = [
+        MagicMock(
+            spec=ResourceChange,
+            type="aws_db_proxy_target",
+            address="aws_db_proxy_target.db_instance",
+            change=MagicMock(
+                after={"db_instance_identifier": "rds-db-instance-id"},
+                actions=[Action.ActionDelete, Action.ActionCreate],
+            ),
+        )
+    ]
+
+    validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
+    assert validator.validate() == (not expected)
+    mock_aws_api.return_value.get_db_instance_ref.assert_called_once_with(
+        "rds-db-instance-id"
+    )
+    [result] = [r for r in validator.results.results if r.check == "db_instance"]
+    assert result.resource == "aws_db_proxy_target.db_instance"
+    assert [f.code for f in result.findings] == expected
+
+
+@pytest.mark.parametrize(
+    ("proxy", "expected"),
+    [
+        (("REQUIRED", True), []),
+        (("REQUIRED", False), ["IAM_AUTH_WITHOUT_TLS"]),
+        (("DISABLED", False), []),
+        ((None, False), []),
+    ],
+)
+def test_rds_proxy_plan_validator_iam_auth(
+    ai_input: AppInterfaceInput,
+    mock_terraform_plan_parser: MagicMock,
+    mock_aws_api: MagicMock,  # ruff: ignore[unused-function-argument]
+    proxy: tuple[str | None, bool],
+    expected: list[str],
+) -> None:
+    """Test IAM auth requires TLS, read from the planned proxy.
+
+    proxy is the planned (iam_auth, require_tls).
+    """
+    iam_auth, require_tls = proxy
+    mock_terraform_plan_parser.plan.resource_changes = [
+        MagicMock(
+            spec=ResourceChange,
+            type="aws_db_proxy",
+            address="aws_db_proxy.this",
+            change=MagicMock(
+                before={"auth": [{"iam_auth": iam_auth}], "require_tls": True},
+                after={"auth": [{"iam_auth": iam_auth}], "require_tls": require_tls},
+                actions=[Action.ActionUpdate],
+            ),
+        )
+    ]
+
+    validator = RdsProxyPlanValidator(mock_terraform_plan_parser, ai_input)
+    assert validator.validate() == (not expected)
+    [result] = [r for r in validator.results.results if r.check == "iam_auth"]
+    assert result.resource == "aws_db_proxy.this"
+    assert [f.code for f in result.findings] == expected
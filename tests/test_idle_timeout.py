@@ -0,0 +1,155 @@
+from typing import Any
+
+import pytest
+from external_resources_io.input import parse_model
+from pydantic import ValidationError
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.idle_timeout import (
+    EPHEMERAL_IDLE_CLIENT_TIMEOUT,
+    analyze_idle_timeout,
+)
+from tests.conftest import build_input_data
+
+
+def build_input(
+    client_pools: list[dict],
+    **kwargs: Any,  # ruff: ignore[any-type]
+) -> AppInterfaceInput:
+    return parse_model(
+        AppInterfaceInput, build_input_data(client_pools=client_pools, **kwargs)
+    )
+
+
+def test_no_client_pools(ai_input: AppInterfaceInput) -> None:
+    """Test nothing is reported without client pool settings."""
+    analysis = analyze_idle_timeout(ai_input.data)
+    assert analysis.warnings == []
+    assert analysis.recommended_idle_client_timeout == ai_input.data.idle_client_timeout
+
+
+def test_proxy_closes_pooled_connections() -> None:
+    """Test pools without keepalive that outlive idle_client_timeout."""
+    ai_input = build_input([
+        {"name": "api", "replicas": 10, "max_pool_size": 18, "max_lifetime": 3600},
+        {"name": "cron", "max_pool_size": 10},
+    ])
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    assert analysis.consumers[0].connection_lifetime == pytest.approx(1800)
+    assert analysis.consumers[1].reconnects_per_second == pytest.approx(10 / 1800)
+    assert analysis.reconnects_per_second == pytest.approx(0.1 + 10 / 1800)
+    assert analysis.tls_handshakes_per_second == pytest.approx(0.1 + 10 / 1800)
+    assert analysis.recommended_idle_client_timeout == pytest.approx(3660)
+    assert analysis.warnings == [
+        (
+            "idle_client_timeout (1800s) closes idle connections of api before its "
+            "pool retires them, causing 0.1 reconnects/s; set a keepalive or an idle "
+            "timeout/max lifetime below 1800s"
+        ),
+        (
+            "idle_client_timeout (1800s) closes idle connections of cron before its "
+            "pool retires them, causing 0.00556 reconnects/s; set a keepalive or an "
+            "idle timeout/max lifetime below 1800s"
+        ),
+        (
+            "idle_client_timeout (1800s) is shorter than the client pools need, "
+            "recommended: 3660s"
+        ),
+    ]
+
+
+def test_keepalive_pool() -> None:
+    """Test a pool kept alive below idle_client_timeout does not churn."""
+    ai_input = build_input(
+        [{"name": "api", "max_pool_size": 10, "keepalive_interval": 60}],
+        require_tls=False,
+    )
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    assert analysis.consumers[0].connection_lifetime is None
+    assert analysis.reconnects_per_second == pytest.approx(0)
+    assert analysis.warnings == []
+
+
+def test_ephemeral_consumers() -> None:
+    """Test lambdas abandoning connections get a short timeout recommendation."""
+    ai_input = build_input([
+        {"name": "lambda", "replicas": 500, "max_pool_size": 1, "ephemeral": True}
+    ])
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    assert analysis.recommended_idle_client_timeout == EPHEMERAL_IDLE_CLIENT_TIMEOUT
+    assert analysis.warnings == [
+        (
+            "idle_client_timeout (1800s) keeps abandoned connections open much "
+            "longer than needed, recommended: 300s"
+        )
+    ]
+
+
+def test_tls_handshake_load() -> None:
+    """Test connection churn turning into TLS handshake load."""
+    ai_input = build_input(
+        [{"name": "workers", "replicas": 300, "max_pool_size": 20, "idle_timeout": 30}],
+        idle_client_timeout=120,
+    )
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    assert analysis.tls_handshakes_per_second == pytest.approx(200)
+    assert analysis.warnings == [
+        "Connection churn causes 200 TLS handshakes/s on the proxy"
+    ]
+
+
+def test_min_pool_size_connections_closed_while_idle() -> None:
+    """Test min_pool_size connections outlive the pool idle timeout."""
+    ai_input = build_input([
+        {
+            "name": "api",
+            "replicas": 10,
+            "min_pool_size": 5,
+            "max_pool_size": 18,
+            "idle_timeout": 600,
+        }
+    ])
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    [consumer] = analysis.consumers
+    assert consumer.connection_lifetime == pytest.approx(600)
+    assert consumer.min_idle_connections == 50  # ruff: ignore[magic-value-comparison]
+    assert consumer.min_idle_connection_lifetime == pytest.approx(1800)
+    assert analysis.reconnects_per_second == pytest.approx(130 / 600 + 50 / 1800)
+    assert analysis.warnings[0] == (
+        "idle_client_timeout (1800s) closes the 50 min_pool_size connections of api "
+        "while idle, causing 0.244 reconnects/s; set a keepalive or a max lifetime "
+        "below 1800s"
+    )
+
+
+def test_min_pool_size_with_keepalive() -> None:
+    """Test keepalives keep min_pool_size connections open."""
+    ai_input = build_input([
+        {
+            "name": "api",
+            "min_pool_size": 5,
+            "max_pool_size": 10,
+            "idle_timeout": 600,
+            "keepalive_interval": 60,
+        }
+    ])
+    analysis = analyze_idle_timeout(ai_input.data)
+
+    assert analysis.consumers[0].min_idle_connection_lifetime is None
+    assert analysis.reconnects_per_second == pytest.approx(5 / 600)
+    assert analysis.warnings == []
+
+
+@pytest.mark.parametrize(
+    "field", ["keepalive_interval", "idle_timeout", "max_lifetime"]
+)
+@pytest.mark.parametrize("value", [0, -1])
+def test_client_pool_timeouts_positive(field: str, value: int) -> None:
+    """Test pool timeouts must be positive."""
+    with pytest.raises(ValidationError, match="greater than or equal to 1"):
+        build_input([{"name": "api", "max_pool_size": 10, field: value}])
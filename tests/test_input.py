@@ -1,7 +1,14 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
 from pydantic import ValidationError
 
-from er_aws_rds_proxy.app_interface_input import AppInterfaceInput, Auth
+from er_aws_rds_proxy.app_interface_input import (
+    DEBUG_LOG_GROUP_RETENTION_IN_DAYS,
+    Alarms,
+    AppInterfaceInput,
+    Auth,
+)
 from tests.conftest import build_input_data
 
 # ruff: file-ignore[hardcoded-password-string, hardcoded-password-func-arg]
@@ -70,3 +77,98 @@ def test_multiple_auth_configs() -> None:
             client_password_auth_type="POSTGRES_SCRAM_SHA_256",
         ),
     ]
+
+
+def test_alarms_disabled_by_default() -> None:
+    """Test no alarms are configured unless requested."""
+    model = AppInterfaceInput.model_validate(build_input_data())
+    assert model.data.alarms is None
+
+
+@pytest.mark.parametrize(
+    ("connection_borrow_timeout", "expected"),
+    [(None, 100_000), (5, 50_000), (0, 1_000)],
+)
+def test_alarms_borrow_latency_threshold_derived(
+    connection_borrow_timeout: int | None, expected: int
+) -> None:
+    """Test the borrow latency threshold is derived from connection_borrow_timeout."""
+    data = build_input_data(
+        alarms={}, connection_borrow_timeout=connection_borrow_timeout
+    )
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.alarms is not None
+    assert model.data.alarms.borrow_latency_threshold == expected
+
+
+def test_alarms_explicit_thresholds_preserved() -> None:
+    """Test explicitly set thresholds are not overridden."""
+    data = build_input_data(
+        alarms={"borrow_latency_threshold": 5_000, "session_pinned_threshold": None}
+    )
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.alarms == Alarms(
+        borrow_latency_threshold=5_000, session_pinned_threshold=None
+    )
+
+
+def test_alarms_explicit_null_threshold_drops_alarm() -> None:
+    """Test an explicit null borrow_latency_threshold is not derived."""
+    data = build_input_data(alarms={"borrow_latency_threshold": None})
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.alarms is not None
+    assert model.data.alarms.borrow_latency_threshold is None
+
+
+@pytest.mark.parametrize("period", [10, 30, 60, 300])
+def test_alarms_period_valid(period: int) -> None:
+    """Test periods supported by CloudWatch alarms."""
+    assert Alarms(period=period).period == period
+
+
+@pytest.mark.parametrize(
+    ("alarms", "message"),
+    [
+        ({"period": 0}, "period must be 10, 30 or a multiple of 60"),
+        ({"period": 45}, "period must be 10, 30 or a multiple of 60"),
+        ({"period": -60}, "period must be 10, 30 or a multiple of 60"),
+        ({"evaluation_periods": 0}, "greater than or equal to 1"),
+    ],
+)
+def test_alarms_invalid(alarms: dict, message: str) -> None:
+    """Test invalid alarm periods are rejected."""
+    with pytest.raises(ValidationError, match=message):
+        Alarms.model_validate(alarms)
+
+
+def test_debug_logging_expired() -> None:
+    """Test debug_logging is turned off once expired."""
+    data = build_input_data(
+        debug_logging=True,
+        debug_logging_expires_at="2020-01-01T00:00:00",
+        log_group_retention_in_days=30,
+    )
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.debug_logging is False
+    assert model.data.debug_logging_expires_at == datetime(2020, 1, 1, tzinfo=UTC)
+    assert model.data.log_group_retention_in_days == 30  # ruff: ignore[magic-value-comparison]
+
+
+@pytest.mark.parametrize("retention", [30, 0])
+def test_debug_logging_not_expired_caps_retention(retention: int) -> None:
+    """Test active debug_logging caps the log retention, 0 never expires."""
+    data = build_input_data(
+        debug_logging=True,
+        debug_logging_expires_at=(datetime.now(UTC) + timedelta(hours=1)).isoformat(),
+        log_group_retention_in_days=retention,
+    )
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.debug_logging is True
+    assert model.data.log_group_retention_in_days == DEBUG_LOG_GROUP_RETENTION_IN_DAYS
+
+
+def test_debug_logging_short_retention_preserved() -> None:
+    """Test a retention shorter than the cap is kept."""
+    data = build_input_data(debug_logging=True, log_group_retention_in_days=1)
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.log_group_retention_in_days == 1
@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING
 import pytest
 from external_resources_io.config import EnvVar
 
-from er_aws_rds_proxy.__main__ import get_ai_input
+from er_aws_rds_proxy.__main__ import get_ai_input, main
 from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
 from tests.conftest import build_input_data
 
@@ -27,3 +27,27 @@ def test_get_ai_input(ai_input: AppInterfaceInput) -> None:
     main_ai_input = get_ai_input()
     assert isinstance(main_ai_input, AppInterfaceInput)
     assert main_ai_input == ai_input
+
+
+@pytest.mark.parametrize(
+    ("argv", "profiled"), [([], False), (["--profile"], True)], ids=["plain", "profile"]
+)
+def test_main(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    argv: list[str],
+    profiled: bool,  # ruff: ignore[boolean-type-hint-positional-argument]
+) -> None:
+    """Test main writes the terraform config and profiles only when asked."""
+    work = tmp_path / "work"
+    monkeypatch.setenv(EnvVar.BACKEND_TF_FILE, str(tmp_path / "backend.tf"))
+    monkeypatch.setenv(EnvVar.TF_VARS_FILE, str(tmp_path / "terraform.tfvars.json"))
+    monkeypatch.setenv("WORK", str(work))
+    monkeypatch.delenv("PROFILE", raising=False)
+
+    main(argv)
+
+    assert (tmp_path / "backend.tf").is_file()
+    assert (tmp_path / "terraform.tfvars.json").is_file()
+    for suffix in (".prof", ".collapsed", ".memory.txt"):
+        assert (work / f"generate-tf-config{suffix}").is_file() == profiled
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pstats
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from er_aws_rds_proxy.profiling import StackSampler, profile, profiling_enabled
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def busy(seconds: float) -> list[bytes]:
+    """Burn CPU and allocate memory for a while."""
+    chunks = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        chunks.append(bytes(1024))
+    return chunks
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("1", True), ("true", True), ("ON", True), ("0", False), ("", False)],
+)
+def test_profiling_enabled(
+    monkeypatch: pytest.MonkeyPatch, value: str, *, expected: bool
+) -> None:
+    """Test the PROFILE switch."""
+    monkeypatch.setenv("PROFILE", value)
+    assert profiling_enabled() is expected
+
+
+def test_profile_disabled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test nothing is written unless enabled."""
+    monkeypatch.delenv("PROFILE", raising=False)
+    monkeypatch.setenv("WORK", str(tmp_path))
+    with profile("test"):
+        busy(0.01)
+    assert not list(tmp_path.iterdir())
+
+
+def test_profile_writes_output(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Test cProfile, collapsed stacks and memory summary are written to $WORK."""
+    monkeypatch.setenv("PROFILE", "1")
+    monkeypatch.setenv("WORK", str(tmp_path))
+    with profile("test"):
+        busy(0.1)
+
+    stats = pstats.Stats(str(tmp_path / "test.prof"))
+    assert any(func == "busy" for _, _, func in stats.stats)  # type: ignore[attr-defined]
+    collapsed = (tmp_path / "test.collapsed").read_text().splitlines()
+    assert collapsed
+    assert any("busy (test_profiling.py:" in line for line in collapsed)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+    memory = (tmp_path / "test.memory.txt").read_text()
+    assert memory.startswith("Peak traced memory: ")
+    assert "test_profiling.py" in memory
+
+
+def test_profile_writes_output_on_exit(tmp_path: Path) -> None:
+    """Test output is written when the profiled block exits the process."""
+    with pytest.raises(SystemExit), profile(str(tmp_path / "exit"), enabled=True):
+        raise SystemExit(1)
+    assert (tmp_path / "exit.prof").exists()
+
+
+def test_stack_sampler_collapsed() -> None:
+    """Test samples are aggregated per stack, root frame first."""
+    sampler = StackSampler(thread_id=0)
+    sampler.stacks.update(["main;a;b", "main;a;b", "main;c"])
+    assert sampler.collapsed() == "main;a;b 2\nmain;c 1\n"
@@ -0,0 +1,73 @@
+import pytest
+from pydantic import ValidationError
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.rules import Violation, compile_rules, violations
+from tests.conftest import build_input_data
+
+
+def test_valid_input_has_no_violations(ai_input: AppInterfaceInput) -> None:
+    """Test the default input passes all rules."""
+    assert violations(ai_input.data) == []
+
+
+def test_compile_rules_cached_per_engine_family() -> None:
+    """Test rules are compiled once per engine family."""
+    assert compile_rules("MYSQL") is compile_rules("MYSQL")
+    assert compile_rules("MYSQL") is not compile_rules("POSTGRESQL")
+
+
+@pytest.mark.parametrize(
+    ("engine_family", "expected"),
+    [
+        ("MYSQL", "MYSQL_NATIVE_PASSWORD"),
+        ("POSTGRESQL", "POSTGRES_SCRAM_SHA_256"),
+        ("SQLSERVER", "SQL_SERVER_AUTHENTICATION"),
+    ],
+)
+def test_client_password_auth_type_defaults(engine_family: str, expected: str) -> None:
+    """Test client_password_auth_type defaults per engine family."""
+    data = build_input_data(engine_family=engine_family)
+    model = AppInterfaceInput.model_validate(data)
+    assert model.data.auth[0].client_password_auth_type == expected
+
+
+def test_all_violations_reported() -> None:
+    """Test every violation is reported in a single validation."""
+    data = build_input_data(
+        engine_family="MYSQL",
+        max_connections_percent=0,
+        idle_client_timeout=30_000,
+        connection_borrow_timeout=3601,
+        auth=[
+            {"auth_scheme": "SECRETS", "secret_name": "secret"},
+            {"auth_scheme": "SECRETS", "client_password_auth_type": "POSTGRES_MD5"},
+        ],
+    )
+    with pytest.raises(ValidationError) as e:
+        AppInterfaceInput.model_validate(data)
+    message = str(e.value)
+    for expected in (
+        "max_connections_percent must be between 1 and 100, got 0",
+        "max_idle_connections_percent (50) must not be greater than",
+        "idle_client_timeout must be between 1 and 28800, got 30000",
+        "connection_borrow_timeout must be between 0 and 3600, got 3601",
+        "auth[1].secret_name: secret_name must be set when auth_scheme is SECRETS",
+        "auth[1].client_password_auth_type: client_password_auth_type must be one of",
+    ):
+        assert expected in message
+
+
+def test_unknown_engine_family() -> None:
+    """Test an unknown engine family is reported and gets no auth default."""
+    data = build_input_data(engine_family="ORACLE")
+    with pytest.raises(
+        ValidationError,
+        match="engine_family must be one of MYSQL, POSTGRESQL, SQLSERVER, got ORACLE",
+    ):
+        AppInterfaceInput.model_validate(data)
+
+
+def test_violation_str() -> None:
+    """Test violations render as field: message."""
+    assert str(Violation("auth[0].iam_auth", "invalid")) == "auth[0].iam_auth: invalid"
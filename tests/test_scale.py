@@ -0,0 +1,199 @@
+"""Fleet scale test: render and validate 10k synthetic proxies.
+
+Skipped unless SCALE_TEST is set, run it with `make scale-test`. Every proxy
+goes through config generation and RdsProxyPlanValidator against the local
+stand-in, the per-stage breakdown is printed and the wall time and peak RSS
+are checked against their budgets.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from external_resources_io.input import parse_model
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.bulk import render, work_dir_for
+from hooks.post_plan import RdsProxyPlanValidator, TerraformJsonPlanParser
+from hooks_lib.aws_api import AWSApi
+from tests.aws_stand_in import AWSStandIn
+from tests.conftest import DEFAULT_PROVISION, build_input_data
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+    from pathlib import Path
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("SCALE_TEST"), reason="set SCALE_TEST=1 to run"
+)
+
+PROXIES = 10_000
+VPCS = 50
+SUBNETS_PER_VPC = 3
+ENGINES = {"POSTGRESQL": "postgres", "MYSQL": "mysql"}
+# Budgets for the whole run, with headroom for slower CI runners
+WALL_TIME_BUDGET = 180.0
+PEAK_RSS_BUDGET = 512 * 2**20
+
+
+def peak_rss() -> int:
+    """Peak resident set size of the process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Stages:
+    """Wall time and peak RSS after each stage."""
+
+    def __init__(self) -> None:
+        self.rows: list[tuple[str, float, int]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None]:
+        """Time a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.rows.append((name, time.perf_counter() - start, peak_rss()))
+
+    @property
+    def total(self) -> float:
+        """Wall time of all stages."""
+        return sum(duration for _, duration, _ in self.rows)
+
+    def breakdown(self) -> str:
+        """Human readable per-stage breakdown."""
+        lines = [f"{'stage':<14} {'seconds':>8} {'per proxy':>10} {'peak RSS':>10}"]
+        lines.extend(
+            f"{name:<14} {duration:8.2f} {duration / PROXIES * 1000:8.3f}ms "
+            f"{rss / 2**20:7.0f}MiB"
+            for name, duration, rss in self.rows
+        )
+        lines.append(f"{'total':<14} {self.total:8.2f}")
+        return "\n".join(lines) + "\n"
+
+
+def synthetic_input(i: int) -> dict[str, Any]:
+    """Input of the i-th proxy, proxies share the networking of their VPC."""
+    vpc = i % VPCS
+    engine_family = list(ENGINES)[i % len(ENGINES)]
+    data = build_input_data(
+        identifier=f"proxy-{i:05}",
+        db_instance_identifier=f"db-{i:05}",
+        engine_family=engine_family,
+        vpc_subnet_ids=[f"subnet-{vpc}-{n}" for n in range(SUBNETS_PER_VPC)],
+        vpc_security_group_ids=[f"sg-{vpc}"],
+    )
+    data["provision"] = DEFAULT_PROVISION | {"identifier": f"proxy-{i:05}"}
+    return data
+
+
+def synthetic_plan(data: dict[str, Any]) -> dict[str, Any]:
+    """Plan JSON creating the proxy and its target."""
+    return {
+        "format_version": "1.2",
+        "resource_changes": [
+            {
+                "address": "aws_db_proxy.this",
+                "type": "aws_db_proxy",
+                "name": "this",
+                "change": {
+                    "actions": ["create"],
+                    "after": {
+                        "vpc_subnet_ids": data["vpc_subnet_ids"],
+                        "vpc_security_group_ids": data["vpc_security_group_ids"],
+                    },
+                    "after_unknown": {},
+                },
+            },
+            {
+                "address": "aws_db_proxy_target.db_instance",
+                "type": "aws_db_proxy_target",
+                "name": "db_instance",
+                "change": {
+                    "actions": ["create"],
+                    "after": {"db_instance_identifier": data["db_instance_identifier"]},
+                    "after_unknown": {},
+                },
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def fleet_stand_in(monkeypatch: pytest.MonkeyPatch) -> Iterator[AWSStandIn]:
+    """Stand-in knowing the networking and DB instances of every proxy."""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("WORK", raising=False)
+    with AWSStandIn(
+        subnets={
+            f"subnet-{vpc}-{n}": f"vpc-{vpc}"
+            for vpc in range(VPCS)
+            for n in range(SUBNETS_PER_VPC)
+        },
+        security_groups={f"sg-{vpc}": f"vpc-{vpc}" for vpc in range(VPCS)},
+        db_instances={
+            f"db-{i:05}": list(ENGINES.values())[i % len(ENGINES)]
+            for i in range(PROXIES)
+        },
+    ) as stand_in:
+        yield stand_in
+
+
+def test_fleet_scale(
+    fleet_stand_in: AWSStandIn, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test 10k proxies render and validate within the time and memory budget."""
+    stages = Stages()
+
+    with stages.stage("generate"):
+        documents = [synthetic_input(i) for i in range(PROXIES)]
+        plan_files = []
+        for i, document in enumerate(documents):
+            plan_file = tmp_path / "plans" / f"{i:05}.json"
+            plan_file.parent.mkdir(exist_ok=True)
+            plan_file.write_text(json.dumps(synthetic_plan(document["data"])))
+            plan_files.append(plan_file)
+
+    with stages.stage("parse inputs"):
+        inputs = [parse_model(AppInterfaceInput, document) for document in documents]
+
+    with stages.stage("render"):
+        for ai_input in inputs:
+            work_dir = work_dir_for(tmp_path / "work", ai_input)
+            work_dir.mkdir(parents=True)
+            render(ai_input, work_dir)
+
+    with stages.stage("parse plans"):
+        plans = [TerraformJsonPlanParser(plan_path=str(f)) for f in plan_files]
+
+    with stages.stage("validate"):
+        aws_api = AWSApi(
+            config_options={"region_name": "us-east-1"},
+            endpoint_url=fleet_stand_in.endpoint_url,
+        )
+        failed = [
+            ai_input.data.identifier
+            for ai_input, plan in zip(inputs, plans, strict=True)
+            if not RdsProxyPlanValidator(plan, ai_input, aws_api=aws_api).validate()
+        ]
+
+    with capsys.disabled():
+        sys.stdout.write(f"\n{PROXIES} proxies\n{stages.breakdown()}")
+
+    assert not failed
+    assert fleet_stand_in.requests == {
+        "DescribeSubnets": PROXIES,
+        "DescribeSecurityGroups": PROXIES,
+        "DescribeDBInstances": PROXIES,
+    }
+    assert stages.total < WALL_TIME_BUDGET
+    assert peak_rss() < PEAK_RSS_BUDGET
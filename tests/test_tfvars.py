@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from er_aws_rds_proxy.app_interface_input import AppInterfaceInput
+from er_aws_rds_proxy.tfvars import (
+    dump_tf_vars_json,
+    write_tf_vars_json,
+    write_tf_vars_json_into,
+)
+from tests.conftest import build_input_data
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def test_dump_tf_vars_json_canonical(ai_input: AppInterfaceInput) -> None:
+    """Test keys are sorted, None values dropped and no whitespace emitted."""
+    content = dump_tf_vars_json(ai_input.data)
+    data = json.loads(content)
+    assert list(data) == sorted(data)
+    assert list(data["tags"]) == sorted(data["tags"])
+    assert "alarms" not in data
+    assert data == json.loads(ai_input.data.model_dump_json(exclude_none=True))
+    assert content == json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+
+
+def test_dump_tf_vars_json_independent_of_input_order() -> None:
+    """Test equal inputs with differently ordered dicts give identical bytes."""
+    data = build_input_data()
+    reordered = build_input_data(tags=dict(reversed(data["data"]["tags"].items())))
+    assert dump_tf_vars_json(
+        AppInterfaceInput.model_validate(data).data
+    ) == dump_tf_vars_json(AppInterfaceInput.model_validate(reordered).data)
+
+
+def test_write_tf_vars_json(ai_input: AppInterfaceInput, tmp_path: Path) -> None:
+    """Test the file is replaced and no temporary file is left behind."""
+    output = tmp_path / "terraform.tfvars.json"
+    output.write_text("{}")
+    assert write_tf_vars_json(ai_input.data, output) == output
+    assert output.read_bytes() == dump_tf_vars_json(ai_input.data)
+    assert [p.name for p in tmp_path.iterdir()] == [output.name]
+
+
+def test_write_tf_vars_json_failure_keeps_original(
+    ai_input: AppInterfaceInput, tmp_path: Path, mocker: MockerFixture
+) -> None:
+    """Test a failed write leaves the previous file untouched."""
+    output = tmp_path / "terraform.tfvars.json"
+    output.write_text("{}")
+    mocker.patch("pathlib.Path.replace", side_effect=OSError("boom"))
+    with pytest.raises(OSError, match="boom"):
+        write_tf_vars_json(ai_input.data, output)
+    assert output.read_text() == "{}"
+    assert [p.name for p in tmp_path.iterdir()] == [output.name]
+
+
+def test_write_tf_vars_json_into(ai_input: AppInterfaceInput) -> None:
+    """Test writing into a caller provided buffer."""
+    buffer = io.BytesIO()
+    size = write_tf_vars_json_into(ai_input.data, buffer)
+    assert buffer.getvalue() == dump_tf_vars_json(ai_input.data)
+    assert size == len(buffer.getvalue())